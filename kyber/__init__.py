@@ -3,6 +3,7 @@
 # Core components
 from .params import KYBER512, KYBER768, KYBER1024, KyberParams
 from .poly import Polynomial
+from .polyvec import PolyVec, PolyMat
 from .ntt import ntt, invntt
 from .symmetric import hash_g, hash_h, kdf, prf, cbd
 
@@ -17,7 +18,7 @@ __all__ = [
     'KYBER512', 'KYBER768', 'KYBER1024', 'KyberParams',
 
     # Polynomial arithmetic
-    'Polynomial', 'ntt', 'invntt',
+    'Polynomial', 'PolyVec', 'PolyMat', 'ntt', 'invntt',
 
     # Symmetric primitives
     'hash_g', 'hash_h', 'kdf', 'prf', 'cbd',
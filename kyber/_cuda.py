@@ -0,0 +1,218 @@
+"""
+Batched encapsulation on a CUDA GPU via numba.cuda
+
+Hashing, Â expansion and noise sampling stay on the host; the GPU runs the
+ring arithmetic of PKE.Encrypt with one thread block per encapsulation and
+one thread per butterfly (NTT) or degree-1 residue pair (basemul), then
+compresses u and v in a second elementwise kernel. Every encapsulation may
+target a different public key. Below CUDA_MIN_BATCH encapsulations, or
+without a GPU, the CPU path is used instead.
+"""
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numba import cuda, int32
+
+from .params import KYBER512, KyberParams
+from .ntt import GAMMAS
+from .pke import (encrypt, decode_pk, generate_matrix_A, sample_batch_noise,
+                  decode_message, pack_bits)
+from .symmetric import hash_g, hash_h, kdf
+from ._ntt_numba import Q, QINV, ZETAS_MONT, ZETAS_INV_MONT, F_MONT
+
+# Transfers and launch overhead only pay off for large batches
+CUDA_MIN_BATCH = 256
+
+THREADS_PER_BLOCK = 128  # one butterfly per thread per NTT level
+MAX_K = 4
+
+
+@cuda.jit(device=True)
+def _fqmul(a, b):
+    """a * b * 2^-16 mod q, result in (-q, q)"""
+    x = a * b
+    u = (((x * QINV) & 0xffff) ^ 0x8000) - 0x8000
+    return (x - u * Q) >> 16
+
+
+@cuda.jit(device=True)
+def _barrett_reduce(a):
+    """a mod q, result in (-q/2, q/2]"""
+    return a - ((a * 20159 + (1 << 25)) >> 26) * Q
+
+
+@cuda.jit(device=True)
+def _caddq(a):
+    """a mod q for a in [-q, q), without a branch"""
+    return a + ((a >> 15) & Q)
+
+
+@cuda.jit(device=True)
+def _ntt_shared(poly, row, t):
+    """In-place forward NTT of shared poly[row], thread t runs butterfly t of each level"""
+    distance = 128
+    level = 0
+    while distance >= 2:
+        group = t // distance
+        j = 2 * distance * group + t % distance
+        x = _fqmul(ZETAS_MONT[(1 << level) + group], poly[row, j + distance])
+        poly[row, j + distance] = poly[row, j] - x
+        poly[row, j] = poly[row, j] + x
+        cuda.syncthreads()
+        distance >>= 1
+        level += 1
+
+    for j in range(2 * t, 2 * t + 2):
+        poly[row, j] = _caddq(_barrett_reduce(poly[row, j]))
+    cuda.syncthreads()
+
+
+@cuda.jit(device=True)
+def _invntt_shared(poly, t):
+    """In-place inverse NTT of the shared 256-entry poly"""
+    distance = 2
+    level = 6
+    while distance <= 128:
+        group = t // distance
+        j = 2 * distance * group + t % distance
+        x = poly[j]
+        poly[j] = _barrett_reduce(x + poly[j + distance])
+        poly[j + distance] = _fqmul(ZETAS_INV_MONT[(1 << level) + group], x - poly[j + distance])
+        cuda.syncthreads()
+        distance <<= 1
+        level -= 1
+
+    for j in range(2 * t, 2 * t + 2):
+        poly[j] = _caddq(_fqmul(poly[j], F_MONT))
+    cuda.syncthreads()
+
+
+@cuda.jit(device=True)
+def _basemul_acc(x, y, y_row, t, acc):
+    """acc[2t:2t+2] += pair t of x ◦ y[y_row], x and y in [0, q)"""
+    x0, x1 = x[2 * t], x[2 * t + 1]
+    y0, y1 = y[y_row, 2 * t], y[y_row, 2 * t + 1]
+    acc[2 * t] = (acc[2 * t] + x0 * y0 + (x1 * y1 % Q) * GAMMAS[t]) % Q
+    acc[2 * t + 1] = (acc[2 * t + 1] + x0 * y1 + x1 * y0) % Q
+
+
+@cuda.jit
+def _encrypt_kernel(A_T, t_hat, r, e1, e2, m, u_out, v_out):
+    """Block b computes u = NTT^-1(Â^T ◦ r̂) + e1 and v = NTT^-1(t̂^T ◦ r̂) + e2 + m"""
+    b = cuda.blockIdx.x
+    t = cuda.threadIdx.x
+    k = r.shape[1]
+
+    r_hat = cuda.shared.array((MAX_K, 256), dtype=int32)
+    acc = cuda.shared.array(256, dtype=int32)
+
+    # 1. r̂ = NTT(r), the k polynomials of r held in shared memory
+    for i in range(k):
+        r_hat[i, 2 * t] = r[b, i, 2 * t]
+        r_hat[i, 2 * t + 1] = r[b, i, 2 * t + 1]
+    cuda.syncthreads()
+    for i in range(k):
+        _ntt_shared(r_hat, i, t)
+
+    # 2. u[i] = NTT^-1(Σ_j Â^T[i][j] ◦ r̂[j]) + e1[i]
+    for i in range(k):
+        acc[2 * t] = 0
+        acc[2 * t + 1] = 0
+        for j in range(k):
+            _basemul_acc(A_T[b, i, j], r_hat, j, t, acc)
+        cuda.syncthreads()
+        _invntt_shared(acc, t)
+        for c in range(2 * t, 2 * t + 2):
+            u_out[b, i, c] = (acc[c] + e1[b, i, c]) % Q
+        cuda.syncthreads()
+
+    # 3. v = NTT^-1(Σ_j t̂[j] ◦ r̂[j]) + e2 + m
+    acc[2 * t] = 0
+    acc[2 * t + 1] = 0
+    for j in range(k):
+        _basemul_acc(t_hat[b, j], r_hat, j, t, acc)
+    cuda.syncthreads()
+    _invntt_shared(acc, t)
+    for c in range(2 * t, 2 * t + 2):
+        v_out[b, c] = (acc[c] + e2[b, c] + m[b, c]) % Q
+
+
+@cuda.jit
+def _compress_kernel(x, d, out):
+    """out = ⌈(2^d / q) · x⌋ mod 2^d elementwise over flat x in [0, q)"""
+    idx = cuda.grid(1)
+    if idx < x.size:
+        out[idx] = (((x[idx] << d) + Q // 2) // Q) & ((1 << d) - 1)
+
+
+def _compress_device(x_dev, d: int) -> np.ndarray:
+    """Compress a flat device array to d-bit values, returned on the host"""
+    out = cuda.device_array(x_dev.size, dtype=np.int32)
+    blocks = (x_dev.size + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+    _compress_kernel[blocks, THREADS_PER_BLOCK](x_dev, d, out)
+    return out.copy_to_host()
+
+
+def encrypt_batch_cuda(pks: List[bytes], msgs: List[bytes], coins: List[bytes],
+                       params: KyberParams = KYBER512) -> List[bytes]:
+    """
+    Encrypt msgs[b] to pks[b] with randomness coins[b] for every b
+    Ciphertext b equals encrypt(pks[b], msgs[b], coins[b], params)
+    Returns: list of ciphertexts as bytes
+    """
+    batch = len(pks)
+    if batch < CUDA_MIN_BATCH or not cuda.is_available():
+        return [encrypt(pk, m, r, params) for pk, m, r in zip(pks, msgs, coins)]
+
+    k, n, q = params.k, params.n, params.q
+
+    # 1. Host side: parse every pk, expand Â^T and sample the noise. Fan-out
+    # keys are mostly seen once, so Â bypasses the shared cache rather than
+    # evicting the hot entries of repeated keys
+    A_T = np.empty((batch, k, k, n), dtype=np.int32)
+    t_hat = np.empty((batch, k, n), dtype=np.int32)
+    for b, pk in enumerate(pks):
+        t, rho = decode_pk(pk, params)
+        t_hat[b] = t.data
+        A_T[b] = generate_matrix_A(rho, params).transpose().data
+    r_arr, e1_arr, e2_arr = sample_batch_noise(coins, params)
+    m_arr = np.array([decode_message(m, n, q).coeffs for m in msgs], dtype=np.int32)
+
+    # 2. Device side: ring arithmetic, one block per encapsulation
+    u_dev = cuda.device_array((batch, k, n), dtype=np.int32)
+    v_dev = cuda.device_array((batch, n), dtype=np.int32)
+    _encrypt_kernel[batch, THREADS_PER_BLOCK](
+        cuda.to_device(A_T), cuda.to_device(t_hat),
+        cuda.to_device(r_arr.astype(np.int32)), cuda.to_device(e1_arr.astype(np.int32)),
+        cuda.to_device(e2_arr.astype(np.int32)), cuda.to_device(m_arr),
+        u_dev, v_dev)
+
+    # 3. Compress on the device and pack the whole batch at once; each
+    # ciphertext part is a whole number of bytes, so the packed stream splits evenly
+    c_u = pack_bits(_compress_device(u_dev.reshape(batch * k * n), params.du), params.du)
+    c_v = pack_bits(_compress_device(v_dev.reshape(batch * n), params.dv), params.dv)
+    u_len = k * n * params.du // 8
+    v_len = n * params.dv // 8
+    return [c_u[b * u_len:(b + 1) * u_len] + c_v[b * v_len:(b + 1) * v_len] for b in range(batch)]
+
+
+def encapsulate_batch_cuda(pk_batch: List[bytes], m_batch: Optional[List[bytes]] = None,
+                           params: KyberParams = KYBER512) -> Tuple[List[bytes], List[bytes]]:
+    """
+    One encapsulation to each public key in pk_batch, mirroring
+    KyberKEM.encapsulate_batch; m_batch defaults to fresh random messages
+    Returns: (ciphertexts, shared_secrets)
+    """
+    if m_batch is None:
+        m_batch = [os.urandom(32) for _ in pk_batch]
+
+    # Steps 1-2 per encapsulation: (K, r) = G(m ‖ H(pk))
+    K_r = [hash_g(m + hash_h(pk)) for pk, m in zip(pk_batch, m_batch)]
+
+    # Step 3: all ciphertexts in one GPU launch
+    ciphertexts = encrypt_batch_cuda(pk_batch, m_batch, [K_r_b[32:] for K_r_b in K_r], params)
+
+    # Step 4: K = KDF(K ‖ H(c))
+    shared_secrets = [kdf(K_r_b[:32] + hash_h(c)) for K_r_b, c in zip(K_r, ciphertexts)]
+    return ciphertexts, shared_secrets
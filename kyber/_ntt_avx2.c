@@ -0,0 +1,501 @@
+/*
+ * SIMD NTT kernels for Kyber, loaded from kyber/_ntt_c.py through ctypes.
+ *
+ * Coefficients are int16_t[256] in [0, q) on entry and exit. Twiddles are
+ * kept in Montgomery form (zeta * 2^16 mod q) so every product is reduced
+ * with a multiply-high instead of a division:
+ *
+ *     fqmul(a, z) = mulhi(a, z) - mulhi(mullo(a, z * q^-1), q)
+ *
+ * x86-64 gets an AVX2 path (16 lanes per ymm), aarch64 a NEON path and any
+ * other target the portable scalar code. The AVX2 functions are compiled
+ * with a target attribute and selected at runtime, so the same library is
+ * safe to load on CPUs without AVX2. Define KYBER_NO_SIMD to build only the
+ * scalar code.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(KYBER_NO_SIMD)
+/* portable scalar build only */
+#elif defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+#define KYBER_AVX2 1
+#include <immintrin.h>
+#define AVX2_TARGET __attribute__((target("avx2")))
+#elif defined(__ARM_NEON) && defined(__aarch64__)
+#define KYBER_NEON 1
+#include <arm_neon.h>
+#endif
+
+#define KYBER_Q 3329
+#define QINV (-3327)   /* q^-1 mod 2^16 */
+#define BARRETT_V 20159 /* round(2^26 / q) */
+#define F_PLAIN 3303   /* 1/128 mod q */
+
+static int16_t zetas_mont[128];
+static int16_t zetas_inv_mont[128];
+static int16_t f_mont;
+static int tables_ready = 0;
+
+/* Scalar arithmetic --------------------------------------------------------*/
+
+static int16_t montgomery_reduce(int32_t a)
+{
+    int16_t u = (int16_t)(uint16_t)((uint32_t)a * (uint32_t)QINV);
+    return (int16_t)((a - (int32_t)u * KYBER_Q) >> 16);
+}
+
+static int16_t fqmul(int16_t a, int16_t b)
+{
+    return montgomery_reduce((int32_t)a * b);
+}
+
+static int16_t barrett_reduce(int16_t a)
+{
+    int16_t t = (int16_t)(((int32_t)BARRETT_V * a + (1 << 25)) >> 26);
+    return (int16_t)(a - t * KYBER_Q);
+}
+
+static int16_t freeze(int16_t a)
+{
+    int16_t r = barrett_reduce(a);
+    r += (r >> 15) & KYBER_Q;
+    r -= KYBER_Q;
+    r += (r >> 15) & KYBER_Q;
+    return r;
+}
+
+static int32_t powmod(int32_t base, int32_t exp)
+{
+    int32_t result = 1;
+    base %= KYBER_Q;
+    while (exp > 0) {
+        if (exp & 1)
+            result = result * base % KYBER_Q;
+        base = base * base % KYBER_Q;
+        exp >>= 1;
+    }
+    return result;
+}
+
+static int bitrev7(int i)
+{
+    int r = 0;
+    for (int b = 0; b < 7; b++)
+        r |= ((i >> b) & 1) << (6 - b);
+    return r;
+}
+
+static void init_scalar_tables(void)
+{
+    for (int i = 0; i < 128; i++) {
+        int32_t zeta = powmod(17, bitrev7(i));
+        zetas_mont[i] = (int16_t)(zeta * (1 << 16) % KYBER_Q);
+        zetas_inv_mont[i] = (int16_t)(powmod(zeta, KYBER_Q - 2) * (1 << 16) % KYBER_Q);
+    }
+    f_mont = (int16_t)(F_PLAIN * (1 << 16) % KYBER_Q);
+}
+
+/* Forward levels from from_distance down to to_distance */
+static void ntt_levels_ref(int16_t r[256], int from_distance, int to_distance)
+{
+    for (int distance = from_distance; distance >= to_distance; distance >>= 1) {
+        int k = 128 / distance;
+        for (int start = 0; start < 256; start += 2 * distance) {
+            int16_t zeta = zetas_mont[k++];
+            for (int j = start; j < start + distance; j++) {
+                int16_t t = fqmul(zeta, r[j + distance]);
+                r[j + distance] = r[j] - t;
+                r[j] = r[j] + t;
+            }
+        }
+    }
+}
+
+static void invntt_levels_ref(int16_t r[256], int from_distance, int to_distance)
+{
+    for (int distance = from_distance; distance <= to_distance; distance <<= 1) {
+        int k = 128 / distance;
+        for (int start = 0; start < 256; start += 2 * distance) {
+            int16_t zeta = zetas_inv_mont[k++];
+            for (int j = start; j < start + distance; j++) {
+                int16_t t = r[j];
+                r[j] = barrett_reduce(t + r[j + distance]);
+                r[j + distance] = fqmul(zeta, t - r[j + distance]);
+            }
+        }
+    }
+}
+
+static void ntt_ref(int16_t r[256])
+{
+    ntt_levels_ref(r, 128, 2);
+    for (int j = 0; j < 256; j++)
+        r[j] = freeze(r[j]);
+}
+
+static void invntt_ref(int16_t r[256])
+{
+    invntt_levels_ref(r, 2, 128);
+    for (int j = 0; j < 256; j++)
+        r[j] = freeze(fqmul(r[j], f_mont));
+}
+
+/* AVX2 ---------------------------------------------------------------------*/
+
+#ifdef KYBER_AVX2
+
+/*
+ * Levels with distance 128..16 pair whole registers and use broadcast
+ * twiddles. Distances 8, 4 and 2 live inside a register pair (a, b) and are
+ * brought into lane alignment by shuffle8/shuffle4/shuffle2; each shuffle is
+ * its own inverse, so replaying them in reverse order restores the natural
+ * coefficient order. The per-lane twiddles for those three levels
+ * are derived once by pushing coefficient indices through the same shuffles.
+ */
+static int16_t lane_zetas[3][8][2][16];     /* [level][pair][mont/qinv][lane] */
+static int16_t lane_zetas_inv[3][8][2][16];
+
+AVX2_TARGET static inline __m256i fqmul_avx2(__m256i a, __m256i zeta, __m256i zeta_qinv)
+{
+    const __m256i q = _mm256_set1_epi16(KYBER_Q);
+    __m256i lo = _mm256_mullo_epi16(a, zeta_qinv);
+    __m256i hi = _mm256_mulhi_epi16(a, zeta);
+    lo = _mm256_mulhi_epi16(lo, q);
+    return _mm256_sub_epi16(hi, lo);
+}
+
+AVX2_TARGET static inline __m256i barrett_avx2(__m256i a)
+{
+    const __m256i q = _mm256_set1_epi16(KYBER_Q);
+    const __m256i v = _mm256_set1_epi16(BARRETT_V);
+    const __m256i round = _mm256_set1_epi16(1 << 9);
+    /* (((a * v) >> 16) + 2^9) >> 10 == (a * v + 2^25) >> 26 */
+    __m256i t = _mm256_mulhi_epi16(a, v);
+    t = _mm256_srai_epi16(_mm256_add_epi16(t, round), 10);
+    return _mm256_sub_epi16(a, _mm256_mullo_epi16(t, q));
+}
+
+AVX2_TARGET static inline __m256i freeze_avx2(__m256i a)
+{
+    const __m256i q = _mm256_set1_epi16(KYBER_Q);
+    __m256i r = barrett_avx2(a);
+    r = _mm256_add_epi16(r, _mm256_and_si256(_mm256_srai_epi16(r, 15), q));
+    r = _mm256_sub_epi16(r, q);
+    return _mm256_add_epi16(r, _mm256_and_si256(_mm256_srai_epi16(r, 15), q));
+}
+
+AVX2_TARGET static inline void shuffle8(__m256i *a, __m256i *b)
+{
+    __m256i x = _mm256_permute2x128_si256(*a, *b, 0x20);
+    __m256i y = _mm256_permute2x128_si256(*a, *b, 0x31);
+    *a = x;
+    *b = y;
+}
+
+AVX2_TARGET static inline void shuffle4(__m256i *a, __m256i *b)
+{
+    __m256i x = _mm256_unpacklo_epi64(*a, *b);
+    __m256i y = _mm256_unpackhi_epi64(*a, *b);
+    *a = x;
+    *b = y;
+}
+
+AVX2_TARGET static inline void shuffle2(__m256i *a, __m256i *b)
+{
+    __m256i t = _mm256_castps_si256(_mm256_moveldup_ps(_mm256_castsi256_ps(*b)));
+    __m256i x = _mm256_blend_epi32(*a, t, 0xAA);
+    __m256i s = _mm256_srli_epi64(*a, 32);
+    __m256i y = _mm256_blend_epi32(s, *b, 0xAA);
+    *a = x;
+    *b = y;
+}
+
+AVX2_TARGET static void init_avx2_tables(void)
+{
+    for (int pair = 0; pair < 8; pair++) {
+        int16_t idx[32];
+        for (int i = 0; i < 32; i++)
+            idx[i] = (int16_t)(32 * pair + i);
+        __m256i a = _mm256_loadu_si256((const __m256i *)idx);
+        __m256i b = _mm256_loadu_si256((const __m256i *)(idx + 16));
+
+        for (int level = 0; level < 3; level++) {
+            int distance = 8 >> level;
+            if (level == 0)
+                shuffle8(&a, &b);
+            else if (level == 1)
+                shuffle4(&a, &b);
+            else
+                shuffle2(&a, &b);
+
+            int16_t lanes[16];
+            _mm256_storeu_si256((__m256i *)lanes, a);
+            for (int lane = 0; lane < 16; lane++) {
+                int k = 128 / distance + lanes[lane] / (2 * distance);
+                int16_t z = zetas_mont[k];
+                int16_t zi = zetas_inv_mont[k];
+                lane_zetas[level][pair][0][lane] = z;
+                lane_zetas[level][pair][1][lane] = (int16_t)(uint16_t)((uint32_t)z * (uint32_t)QINV);
+                lane_zetas_inv[level][pair][0][lane] = zi;
+                lane_zetas_inv[level][pair][1][lane] = (int16_t)(uint16_t)((uint32_t)zi * (uint32_t)QINV);
+            }
+        }
+    }
+}
+
+AVX2_TARGET static inline void butterfly_avx2(__m256i *a, __m256i *b, __m256i zeta, __m256i zeta_qinv)
+{
+    __m256i t = fqmul_avx2(*b, zeta, zeta_qinv);
+    *b = _mm256_sub_epi16(*a, t);
+    *a = _mm256_add_epi16(*a, t);
+}
+
+AVX2_TARGET static inline void inv_butterfly_avx2(__m256i *a, __m256i *b, __m256i zeta, __m256i zeta_qinv)
+{
+    __m256i t = *a;
+    *a = barrett_avx2(_mm256_add_epi16(t, *b));
+    *b = fqmul_avx2(_mm256_sub_epi16(t, *b), zeta, zeta_qinv);
+}
+
+AVX2_TARGET static void ntt_avx2(int16_t r[256])
+{
+    __m256i v[16];
+    for (int i = 0; i < 16; i++)
+        v[i] = _mm256_loadu_si256((const __m256i *)(r + 16 * i));
+
+    /* Levels 0-3: distances 128, 64, 32, 16 are whole-register strides */
+    for (int stride = 8; stride >= 1; stride >>= 1) {
+        int k = 8 / stride;
+        for (int start = 0; start < 16; start += 2 * stride) {
+            int16_t z = zetas_mont[k++];
+            __m256i zeta = _mm256_set1_epi16(z);
+            __m256i zeta_qinv = _mm256_set1_epi16((int16_t)(uint16_t)((uint32_t)z * (uint32_t)QINV));
+            for (int j = start; j < start + stride; j++)
+                butterfly_avx2(&v[j], &v[j + stride], zeta, zeta_qinv);
+        }
+    }
+
+    /* Levels 4-6: distances 8, 4, 2 inside each register pair */
+    for (int pair = 0; pair < 8; pair++) {
+        __m256i a = v[2 * pair];
+        __m256i b = v[2 * pair + 1];
+        for (int level = 0; level < 3; level++) {
+            if (level == 0)
+                shuffle8(&a, &b);
+            else if (level == 1)
+                shuffle4(&a, &b);
+            else
+                shuffle2(&a, &b);
+            butterfly_avx2(&a, &b,
+                           _mm256_loadu_si256((const __m256i *)lane_zetas[level][pair][0]),
+                           _mm256_loadu_si256((const __m256i *)lane_zetas[level][pair][1]));
+        }
+        shuffle2(&a, &b);
+        shuffle4(&a, &b);
+        shuffle8(&a, &b);
+        v[2 * pair] = a;
+        v[2 * pair + 1] = b;
+    }
+
+    for (int i = 0; i < 16; i++)
+        _mm256_storeu_si256((__m256i *)(r + 16 * i), freeze_avx2(v[i]));
+}
+
+AVX2_TARGET static void invntt_avx2(int16_t r[256])
+{
+    __m256i v[16];
+    for (int i = 0; i < 16; i++)
+        v[i] = _mm256_loadu_si256((const __m256i *)(r + 16 * i));
+
+    /* Levels 6-4: distances 2, 4, 8 inside each register pair */
+    for (int pair = 0; pair < 8; pair++) {
+        __m256i a = v[2 * pair];
+        __m256i b = v[2 * pair + 1];
+        shuffle8(&a, &b);
+        shuffle4(&a, &b);
+        shuffle2(&a, &b);
+        for (int level = 2; level >= 0; level--) {
+            inv_butterfly_avx2(&a, &b,
+                               _mm256_loadu_si256((const __m256i *)lane_zetas_inv[level][pair][0]),
+                               _mm256_loadu_si256((const __m256i *)lane_zetas_inv[level][pair][1]));
+            if (level == 2)
+                shuffle2(&a, &b);
+            else if (level == 1)
+                shuffle4(&a, &b);
+            else
+                shuffle8(&a, &b);
+        }
+        v[2 * pair] = a;
+        v[2 * pair + 1] = b;
+    }
+
+    /* Levels 3-0: distances 16, 32, 64, 128 */
+    for (int stride = 1; stride <= 8; stride <<= 1) {
+        int k = 8 / stride;
+        for (int start = 0; start < 16; start += 2 * stride) {
+            int16_t z = zetas_inv_mont[k++];
+            __m256i zeta = _mm256_set1_epi16(z);
+            __m256i zeta_qinv = _mm256_set1_epi16((int16_t)(uint16_t)((uint32_t)z * (uint32_t)QINV));
+            for (int j = start; j < start + stride; j++)
+                inv_butterfly_avx2(&v[j], &v[j + stride], zeta, zeta_qinv);
+        }
+    }
+
+    const __m256i f = _mm256_set1_epi16(f_mont);
+    const __m256i f_qinv = _mm256_set1_epi16((int16_t)(uint16_t)((uint32_t)f_mont * (uint32_t)QINV));
+    for (int i = 0; i < 16; i++)
+        _mm256_storeu_si256((__m256i *)(r + 16 * i), freeze_avx2(fqmul_avx2(v[i], f, f_qinv)));
+}
+
+#endif /* KYBER_AVX2 */
+
+/* NEON ---------------------------------------------------------------------*/
+
+#ifdef KYBER_NEON
+
+/* Montgomery multiply of 8 lanes: widen with vmull_s16, narrow with vshrn_n_s32 */
+static inline int16x8_t fqmul_neon(int16x8_t a, int16x8_t zeta)
+{
+    const int16x4_t q = vdup_n_s16(KYBER_Q);
+    const int16x4_t qinv = vdup_n_s16(QINV);
+
+    int32x4_t lo = vmull_s16(vget_low_s16(a), vget_low_s16(zeta));
+    int32x4_t hi = vmull_s16(vget_high_s16(a), vget_high_s16(zeta));
+    int16x4_t u_lo = vmul_s16(vmovn_s32(lo), qinv);
+    int16x4_t u_hi = vmul_s16(vmovn_s32(hi), qinv);
+    lo = vmlsl_s16(lo, u_lo, q);
+    hi = vmlsl_s16(hi, u_hi, q);
+    return vcombine_s16(vshrn_n_s32(lo, 16), vshrn_n_s32(hi, 16));
+}
+
+static inline int16x8_t barrett_neon(int16x8_t a)
+{
+    const int16x4_t v = vdup_n_s16(BARRETT_V);
+    const int32x4_t round = vdupq_n_s32(1 << 25);
+
+    int32x4_t lo = vaddq_s32(vmull_s16(vget_low_s16(a), v), round);
+    int32x4_t hi = vaddq_s32(vmull_s16(vget_high_s16(a), v), round);
+    int16x8_t t = vcombine_s16(vmovn_s32(vshrq_n_s32(lo, 26)), vmovn_s32(vshrq_n_s32(hi, 26)));
+    return vmlsq_s16(a, t, vdupq_n_s16(KYBER_Q));
+}
+
+static void ntt_neon(int16_t r[256])
+{
+    /* Distances 128..8 are whole 8-lane vectors; 4 and 2 stay scalar */
+    for (int distance = 128; distance >= 8; distance >>= 1) {
+        int k = 128 / distance;
+        for (int start = 0; start < 256; start += 2 * distance) {
+            int16x8_t zeta = vdupq_n_s16(zetas_mont[k++]);
+            for (int j = start; j < start + distance; j += 8) {
+                int16x8_t a = vld1q_s16(r + j);
+                int16x8_t b = vld1q_s16(r + j + distance);
+                int16x8_t t = fqmul_neon(b, zeta);
+                vst1q_s16(r + j + distance, vsubq_s16(a, t));
+                vst1q_s16(r + j, vaddq_s16(a, t));
+            }
+        }
+    }
+    ntt_levels_ref(r, 4, 2);
+    for (int j = 0; j < 256; j++)
+        r[j] = freeze(r[j]);
+}
+
+static void invntt_neon(int16_t r[256])
+{
+    invntt_levels_ref(r, 2, 4);
+    for (int distance = 8; distance <= 128; distance <<= 1) {
+        int k = 128 / distance;
+        for (int start = 0; start < 256; start += 2 * distance) {
+            int16x8_t zeta = vdupq_n_s16(zetas_inv_mont[k++]);
+            for (int j = start; j < start + distance; j += 8) {
+                int16x8_t a = vld1q_s16(r + j);
+                int16x8_t b = vld1q_s16(r + j + distance);
+                vst1q_s16(r + j, barrett_neon(vaddq_s16(a, b)));
+                vst1q_s16(r + j + distance, fqmul_neon(vsubq_s16(a, b), zeta));
+            }
+        }
+    }
+    int16x8_t f = vdupq_n_s16(f_mont);
+    for (int j = 0; j < 256; j += 8)
+        vst1q_s16(r + j, fqmul_neon(vld1q_s16(r + j), f));
+    for (int j = 0; j < 256; j++)
+        r[j] = freeze(r[j]);
+}
+
+#endif /* KYBER_NEON */
+
+/* Exported entry points ----------------------------------------------------*/
+
+#ifdef KYBER_AVX2
+static int use_avx2 = 0;
+#endif
+
+static void init(void)
+{
+    if (tables_ready)
+        return;
+    init_scalar_tables();
+#ifdef KYBER_AVX2
+    __builtin_cpu_init();
+    use_avx2 = __builtin_cpu_supports("avx2");
+    if (use_avx2)
+        init_avx2_tables();
+#endif
+    tables_ready = 1;
+}
+
+const char *kyber_ntt_backend(void)
+{
+    init();
+#if defined(KYBER_AVX2)
+    return use_avx2 ? "avx2" : "scalar";
+#elif defined(KYBER_NEON)
+    return "neon";
+#else
+    return "scalar";
+#endif
+}
+
+void kyber_ntt(int16_t r[256])
+{
+    init();
+#if defined(KYBER_AVX2)
+    if (use_avx2) {
+        ntt_avx2(r);
+        return;
+    }
+#elif defined(KYBER_NEON)
+    ntt_neon(r);
+    return;
+#endif
+    ntt_ref(r);
+}
+
+void kyber_invntt(int16_t r[256])
+{
+    init();
+#if defined(KYBER_AVX2)
+    if (use_avx2) {
+        invntt_avx2(r);
+        return;
+    }
+#elif defined(KYBER_NEON)
+    invntt_neon(r);
+    return;
+#endif
+    invntt_ref(r);
+}
+
+/* Transform count consecutive polynomials in one call */
+void kyber_ntt_batch(int16_t *r, size_t count)
+{
+    for (size_t i = 0; i < count; i++)
+        kyber_ntt(r + 256 * i);
+}
+
+void kyber_invntt_batch(int16_t *r, size_t count)
+{
+    for (size_t i = 0; i < count; i++)
+        kyber_invntt(r + 256 * i);
+}
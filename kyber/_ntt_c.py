@@ -0,0 +1,47 @@
+"""ctypes binding to the SIMD NTT kernels in _ntt_avx2.c
+
+Build the shared library in place with:
+
+    python setup.py build_ext --inplace
+"""
+import ctypes
+import os
+from importlib.machinery import EXTENSION_SUFFIXES
+
+import numpy as np
+
+
+def _load_library() -> ctypes.CDLL:
+    here = os.path.dirname(os.path.abspath(__file__))
+    for suffix in EXTENSION_SUFFIXES:
+        path = os.path.join(here, "_ntt_avx2" + suffix)
+        if os.path.exists(path):
+            return ctypes.CDLL(path)
+    raise ImportError("_ntt_avx2 shared library has not been built")
+
+
+_lib = _load_library()
+_lib.kyber_ntt_backend.restype = ctypes.c_char_p
+_lib.kyber_ntt_batch.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+_lib.kyber_ntt_batch.restype = None
+_lib.kyber_invntt_batch.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+_lib.kyber_invntt_batch.restype = None
+
+# "avx2", "neon" or "scalar", depending on the build and the running CPU
+BACKEND = _lib.kyber_ntt_backend().decode()
+
+
+def ntt_kernel(res: np.ndarray) -> None:
+    """In-place forward NTT of canonical coefficients, shape (..., 256)"""
+    buf = np.ascontiguousarray(res, dtype=np.int16)
+    _lib.kyber_ntt_batch(buf.ctypes.data, buf.size // 256)
+    if buf is not res:
+        res[...] = buf
+
+
+def invntt_kernel(res: np.ndarray) -> None:
+    """In-place inverse NTT of canonical coefficients, shape (..., 256)"""
+    buf = np.ascontiguousarray(res, dtype=np.int16)
+    _lib.kyber_invntt_batch(buf.ctypes.data, buf.size // 256)
+    if buf is not res:
+        res[...] = buf
@@ -0,0 +1,89 @@
+"""Numba-compiled NTT kernels with Montgomery and Barrett reduction"""
+import numpy as np
+from numba import njit
+
+from .ntt import ZETAS, F
+
+Q = 3329
+QINV = 62209  # q^-1 mod 2^16
+R = 1 << 16   # Montgomery radix
+
+ZETAS_MONT = np.array([(z * R) % Q for z in ZETAS], dtype=np.int32)
+ZETAS_INV_MONT = np.array([(pow(z, Q - 2, Q) * R) % Q for z in ZETAS], dtype=np.int32)
+F_MONT = (F * R) % Q
+
+
+@njit(cache=True)
+def montgomery_reduce(a):
+    """a * 2^-16 mod q for |a| < q * 2^15, result in (-q, q)"""
+    u = (((a * QINV) & 0xffff) ^ 0x8000) - 0x8000  # signed low 16 bits
+    return (a - u * Q) >> 16
+
+
+@njit(cache=True)
+def barrett_reduce(a):
+    """a mod q for |a| < 2^15, result in (-q/2, q/2]"""
+    t = (a * 20159 + (1 << 25)) >> 26
+    return a - t * Q
+
+
+@njit(cache=True)
+def caddq(a):
+    """a mod q for a in [-q, q), adding q through the sign mask instead of a branch"""
+    return a + ((a >> 15) & Q)
+
+
+@njit(cache=True)
+def fqmul(a, b):
+    """a * b * 2^-16 mod q"""
+    return montgomery_reduce(a * b)
+
+
+@njit(cache=True, fastmath=False, boundscheck=False)
+def _ntt(res, zetas):
+    for row in range(res.shape[0]):
+        r = res[row]
+        k = 1
+        distance = 128
+        while distance >= 2:
+            for start in range(0, 256, 2 * distance):
+                zeta = zetas[k]
+                k += 1
+                for j in range(start, start + distance):
+                    t = fqmul(zeta, r[j + distance])
+                    r[j + distance] = r[j] - t
+                    r[j] = r[j] + t
+            distance >>= 1
+
+        for j in range(256):
+            r[j] = caddq(barrett_reduce(r[j]))
+
+
+@njit(cache=True, fastmath=False, boundscheck=False)
+def _invntt(res, zetas_inv, f):
+    for row in range(res.shape[0]):
+        r = res[row]
+        distance = 2
+        while distance <= 128:
+            k = 256 // (2 * distance)
+            for start in range(0, 256, 2 * distance):
+                zeta = zetas_inv[k]
+                k += 1
+                for j in range(start, start + distance):
+                    t = r[j]
+                    r[j] = barrett_reduce(t + r[j + distance])
+                    r[j + distance] = fqmul(zeta, t - r[j + distance])
+            distance <<= 1
+
+        for j in range(256):
+            r[j] = caddq(fqmul(r[j], f))
+
+
+def ntt_kernel(res: np.ndarray) -> None:
+    """In-place forward NTT of canonical int16 coefficients, shape (..., 256)"""
+    _ntt(res.reshape(-1, 256), ZETAS_MONT)
+
+
+def invntt_kernel(res: np.ndarray) -> None:
+    """In-place inverse NTT of canonical int16 coefficients, shape (..., 256)"""
+    _invntt(res.reshape(-1, 256), ZETAS_INV_MONT, F_MONT)
@@ -1,13 +1,23 @@
-from typing import Tuple
-from .pke import keygen, encrypt, decrypt
+from collections import OrderedDict
+from typing import List, Tuple
+import hmac
+import threading
+import numpy as np
+from .pke import keygen, encrypt, encrypt_batch, decrypt
 from .symmetric import hash_g, hash_h, kdf
 from .params import KYBER512
 import os
 
+# Number of public-key hashes H(pk) remembered per KyberKEM instance
+H_PK_CACHE_SIZE = 1024
+
 
 class KyberKEM:
-    def __init__(self, params=KYBER512):
+    def __init__(self, params=KYBER512, cache_size: int = H_PK_CACHE_SIZE):
         self.params = params
+        self.cache_size = cache_size
+        self._h_pk_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._h_pk_lock = threading.Lock()
 
     def keypair(self) -> Tuple[bytes, bytes]:
         """
@@ -26,16 +36,67 @@ class KyberKEM:
 
         return pk_pke, sk
 
+    def preload_pk(self, pk: bytes) -> None:
+        """
+        Hash a public key ahead of time so encapsulations to it skip H(pk)
+        """
+        self._hash_pk(pk)
+
     def encapsulate(self, pk: bytes) -> Tuple[bytes, bytes]:
         """
         Generate ciphertext and shared secret
         Returns: (ciphertext, shared_secret)
         """
+        return self._encapsulate(pk, self._hash_pk(pk))
+
+    def encapsulate_many(self, pk: bytes, count: int) -> List[Tuple[bytes, bytes]]:
+        """
+        Run count independent encapsulations to the same public key
+        Returns: list of (ciphertext, shared_secret)
+        """
+        ciphertexts, shared_secrets = self.encapsulate_batch(pk, count)
+        return list(zip(ciphertexts, shared_secrets))
+
+    def encapsulate_batch(self, pk: bytes, batch: int) -> Tuple[List[bytes], List[bytes]]:
+        """
+        Run batch encapsulations to the same public key, with the polynomial
+        arithmetic vectorized over the batch axis
+        Returns: (ciphertexts, shared_secrets)
+        """
+        h_pk = self._hash_pk(pk)
+
+        # Steps 1-2 per encapsulation: m ∈ B^32, (K, r) = G(m ‖ H(pk))
+        m_batch = os.urandom(32 * batch)
+        msgs = [m_batch[32 * b:32 * (b + 1)] for b in range(batch)]
+        K_r = [hash_g(m + h_pk) for m in msgs]
+
+        # Step 3: all ciphertexts in one batched PKE.Encrypt
+        ciphertexts = encrypt_batch(pk, msgs, [K_r_b[32:] for K_r_b in K_r], self.params)
+
+        # Step 4: K = KDF(K ‖ H(c))
+        shared_secrets = [kdf(K_r_b[:32] + hash_h(c)) for K_r_b, c in zip(K_r, ciphertexts)]
+        return ciphertexts, shared_secrets
+
+    def _hash_pk(self, pk: bytes) -> bytes:
+        """H(pk), served from a bounded, thread-safe LRU cache"""
+        with self._h_pk_lock:
+            h_pk = self._h_pk_cache.get(pk)
+            if h_pk is not None:
+                self._h_pk_cache.move_to_end(pk)
+                return h_pk
+
+        h_pk = hash_h(pk)
+        with self._h_pk_lock:
+            self._h_pk_cache[pk] = h_pk
+            if len(self._h_pk_cache) > self.cache_size:
+                self._h_pk_cache.popitem(last=False)
+        return h_pk
+
+    def _encapsulate(self, pk: bytes, h_pk: bytes) -> Tuple[bytes, bytes]:
         # Step 1: Generate random m ∈ B^32
         m = os.urandom(32)
 
         # Step 2: Compute (K, r) = G(m ‖ H(pk))
-        h_pk = hash_h(pk)
         K_r = hash_g(m + h_pk)
         K = K_r[:32]  # First 32 bytes
         r = K_r[32:]  # Remaining bytes
@@ -55,11 +116,11 @@ class KyberKEM:
         Returns: shared_secret
         """
         # Step 1: Parse sk = (sk' ‖ pk' ‖ h ‖ z)
-        sk_len = self.params.k * 32  # Size of sk'
+        sk_len = self.params.k * self.params.n * 2  # Size of sk', 2 bytes per coefficient
         sk_pke = sk[:sk_len]
-        pk_pke = sk[sk_len:sk_len * 2]
-        h = sk[sk_len * 2:sk_len * 2 + 32]
-        z = sk[sk_len * 2 + 32:]
+        pk_pke = sk[sk_len:-64]
+        h = sk[-64:-32]
+        z = sk[-32:]
 
         # Step 2: Decrypt m' = PKE.Decrypt(sk', c)
         m_prime = decrypt(sk_pke, c, self.params)
@@ -72,13 +133,18 @@ class KyberKEM:
         # Step 4: Compute c' = PKE.Encrypt(pk', m'; r')
         c_prime = encrypt(pk_pke, m_prime, r_prime, self.params)
 
-        # Step 5: Compute shared secret
+        # Step 5: Compute shared secret KDF(K' ‖ H(c)) if c is valid, else KDF(z ‖ H(c))
         h_c = hash_h(c)
-        if c == c_prime:
-            # Case 1: c is valid
-            shared_secret = kdf(K_prime + h_c)
-        else:
-            # Case 2: c is invalid
-            shared_secret = kdf(z + h_c)
-
-        return shared_secret
\ No newline at end of file
+        shared_secret = kdf(select_bytes(K_prime, z, hmac.compare_digest(c, c_prime)) + h_c)
+
+        return shared_secret
+
+
+def select_bytes(a: bytes, b: bytes, take_a: bool) -> bytes:
+    """
+    Constant-time selection: a if take_a else b, without branching on take_a
+    """
+    mask = np.uint8((int(take_a) - 1) & 0xff)  # 0x00 keeps a, 0xff takes b
+    a_arr = np.frombuffer(a, dtype=np.uint8)
+    b_arr = np.frombuffer(b, dtype=np.uint8)
+    return (a_arr ^ ((a_arr ^ b_arr) & mask)).tobytes()
\ No newline at end of file
@@ -1,59 +1,120 @@
-class Polynomial:
-    def __init__(self, coeffs=None, n=256, q=3329):
-        self.n = n
-        self.q = q
-        self.coeffs = coeffs if coeffs is not None else [0] * n
+import numpy as np
 
+from .poly import Polynomial, caddq, csubq
 
-# Corrected ZETAS array for Kyber's NTT
+
+# ZETAS[i] = 17^bitrev7(i) mod q, the twiddle factors of Kyber's NTT
 ZETAS = [
-    2285, 2571, 2970, 1812, 1493, 1422, 287, 202, 3158, 622, 1577, 182, 962,
-    2127, 1855, 1468, 573, 2004, 264, 383, 2500, 1458, 1727, 3199, 2648, 1017,
-    732, 608, 1787, 411, 3124, 1758, 1223, 652, 2777, 1015, 2036, 1491, 3047,
-    1785, 516, 3321, 3009, 2663, 1711, 2167, 126, 1469, 2476, 3239, 3058, 830,
-    107, 1908, 3082, 2378, 2931, 961, 1821, 2604, 448, 2264, 677, 2054, 2226,
-    430, 555, 843, 2078, 871, 1550, 105, 422, 587, 177, 3094, 3038, 2869, 1574,
-    1653, 3083, 778, 1159, 3182, 2552, 1483, 2727, 1119, 1739, 644, 2457, 349,
-    418, 329, 3173, 3254, 817, 1097, 603, 610, 1322, 2044, 1864, 384, 2114, 3193,
-    1218, 1994, 2455, 220, 2142, 1670, 2144, 1799, 2051, 794, 1819, 2475, 2459,
-    478, 3221, 3021, 996, 991, 958, 1869, 1522, 1628
+    1, 1729, 2580, 3289, 2642, 630, 1897, 848, 1062, 1919, 193, 797, 2786,
+    3260, 569, 1746, 296, 2447, 1339, 1476, 3046, 56, 2240, 1333, 1426, 2094,
+    535, 2882, 2393, 2879, 1974, 821, 289, 331, 3253, 1756, 1197, 2304, 2277,
+    2055, 650, 1977, 2513, 632, 2865, 33, 1320, 1915, 2319, 1435, 807, 452,
+    1438, 2868, 1534, 2402, 2647, 2617, 1481, 648, 2474, 3110, 1227, 910, 17,
+    2761, 583, 2649, 1637, 723, 2288, 1100, 1409, 2662, 3281, 233, 756, 2156,
+    3015, 3050, 1703, 1651, 2789, 1789, 1847, 952, 1461, 2687, 939, 2308, 2437,
+    2388, 733, 2337, 268, 641, 1584, 2298, 2037, 3220, 375, 2549, 2090, 1645,
+    1063, 319, 2773, 757, 2099, 561, 2466, 2594, 2804, 1092, 403, 1026, 1143,
+    2150, 2775, 886, 1722, 1212, 1874, 1029, 2110, 2935, 885, 2154
+]
+
+# Per-level twiddles: level l has 2^l butterfly groups of width 128 >> l
+ZETAS_LEVEL = [
+    np.array(ZETAS[1 << level:2 << level], dtype=np.int32) for level in range(7)
 ]
+ZETAS_INV_LEVEL = [
+    np.array([pow(z, 3327, 3329) for z in ZETAS[1 << level:2 << level]], dtype=np.int32)
+    for level in range(7)
+]
+
+F = 3303  # 3303 ≡ 1/128 mod 3329
+
+# The NTT leaves 128 degree-1 residues; pair i lives modulo X^2 - GAMMAS[i]
+GAMMAS = np.array(
+    [ZETAS[64 + i // 2] if i % 2 == 0 else 3329 - ZETAS[64 + i // 2] for i in range(128)],
+    dtype=np.int32
+)
+
+# Compiled kernels are optional: prefer the C/SIMD library, then Numba,
+# then fall back to the NumPy level passes
+try:
+    from ._ntt_c import ntt_kernel, invntt_kernel
+except (ImportError, OSError):
+    try:
+        from ._ntt_numba import ntt_kernel, invntt_kernel
+    except ImportError:
+        ntt_kernel = invntt_kernel = None
 
 
 def ntt(poly: Polynomial) -> Polynomial:
-    """Corrected Number Theoretic Transform for Kyber"""
+    """Number Theoretic Transform for Kyber"""
     if len(poly.coeffs) != 256:
         raise ValueError("Polynomial must have 256 coefficients")
 
-    res = poly.coeffs.copy()
-    k = 0
-    for level in range(7):
-        distance = 1 << level
-        for start in range(0, 256, distance << 1):
-            zeta = ZETAS[k]
-            k += 1
-            for j in range(start, start + distance):
-                temp = (zeta * res[j + distance]) % poly.q
-                res[j + distance] = (res[j] - temp) % poly.q
-                res[j] = (res[j] + temp) % poly.q
+    res = np.asarray(poly.coeffs, dtype=np.int16) % poly.q
+    ntt_array(res, poly.q)
     return Polynomial(res, q=poly.q)
 
 
 def invntt(poly: Polynomial) -> Polynomial:
-    """Corrected Inverse NTT for Kyber"""
-    res = poly.coeffs.copy()
-    k = 127
+    """Inverse NTT for Kyber"""
+    res = np.asarray(poly.coeffs, dtype=np.int16) % poly.q
+    invntt_array(res, poly.q)
+    return Polynomial(res, q=poly.q)
+
+
+def ntt_array(res: np.ndarray, q: int = 3329) -> None:
+    """In-place NTT of a C-contiguous (..., 256) int16 array of coefficients in [0, q)"""
+    if ntt_kernel is not None and q == 3329:
+        ntt_kernel(res)
+    else:
+        _ntt_levels(res, q)
+
+
+def invntt_array(res: np.ndarray, q: int = 3329) -> None:
+    """In-place inverse NTT of a C-contiguous (..., 256) int16 array of coefficients in [0, q)"""
+    if invntt_kernel is not None and q == 3329:
+        invntt_kernel(res)
+    else:
+        _invntt_levels(res, q)
+
+
+def _ntt_levels(res: np.ndarray, q: int) -> None:
+    """In-place NumPy forward NTT, one vector op per level (products widen to int32)"""
+    for level in range(7):
+        distance = 128 >> level
+        groups = res.reshape(-1, 1 << level, 2, distance)
+        temp = (groups[:, :, 1, :] * ZETAS_LEVEL[level][:, None]) % q
+        groups[:, :, 1, :] = caddq(groups[:, :, 0, :] - temp, q)
+        groups[:, :, 0, :] = csubq(groups[:, :, 0, :] + temp, q)
+
+
+def _invntt_levels(res: np.ndarray, q: int) -> None:
+    """In-place NumPy inverse NTT, one vector op per level"""
     for level in range(6, -1, -1):
-        distance = 1 << level
-        for start in range(0, 256, distance << 1):
-            zeta = ZETAS[k]
-            k -= 1
-            for j in range(start, start + distance):
-                temp = res[j]
-                res[j] = (temp + res[j + distance]) % poly.q
-                res[j + distance] = ((temp - res[j + distance]) * zeta) % poly.q
+        distance = 128 >> level
+        groups = res.reshape(-1, 1 << level, 2, distance)
+        temp = groups[:, :, 0, :].copy()
+        groups[:, :, 0, :] = csubq(temp + groups[:, :, 1, :], q)
+        groups[:, :, 1, :] = (caddq(temp - groups[:, :, 1, :], q) * ZETAS_INV_LEVEL[level][:, None]) % q
 
     # Final scaling with 1/128 mod q
-    f = 1441  # 1441 ≡ 1/128 mod 3329
-    res = [(x * f) % poly.q for x in res]
-    return Polynomial(res, q=poly.q)
\ No newline at end of file
+    res[...] = (res * np.int32(F)) % q
+
+
+def basemul(a: Polynomial, b: Polynomial) -> Polynomial:
+    """Multiply two polynomials in the NTT domain, pairwise on degree-1 residues"""
+    x = np.asarray(a.coeffs, dtype=np.int16) % a.q
+    y = np.asarray(b.coeffs, dtype=np.int16) % a.q
+    return Polynomial(basemul_array(x, y, a.q), q=a.q)
+
+
+def basemul_array(x: np.ndarray, y: np.ndarray, q: int = 3329) -> np.ndarray:
+    """basemul on broadcastable (..., 256) arrays of coefficients in [0, q)"""
+    # Products of two 12-bit values need the int32 width
+    x = x.astype(np.int32).reshape(x.shape[:-1] + (128, 2))
+    y = y.astype(np.int32).reshape(y.shape[:-1] + (128, 2))
+
+    res = np.empty(np.broadcast_shapes(x.shape, y.shape), dtype=np.int16)
+    res[..., 0] = (x[..., 0] * y[..., 0] + (x[..., 1] * y[..., 1] % q) * GAMMAS) % q
+    res[..., 1] = (x[..., 0] * y[..., 1] + x[..., 1] * y[..., 0]) % q
+    return res.reshape(res.shape[:-2] + (256,))
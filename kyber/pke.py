@@ -1,9 +1,19 @@
+from collections import OrderedDict
 from typing import Tuple, List
 from .params import KYBER512, KyberParams
-from .poly import Polynomial
-from .ntt import ntt, invntt
-from .symmetric import hash_g, hash_h, prf
+from .poly import Polynomial, caddq, cmod_q
+from .polyvec import PolyVec, PolyMat
+from .ntt import invntt, ntt_array, invntt_array, basemul_array
+from .symmetric import hash_g, hash_h, prf, cbd, xof, SHAKE128_RATE
+import numpy as np
 import os
+import threading
+
+# Â depends only on ρ, so the most recently used matrices are kept for
+# repeated encapsulations to (and decapsulations with) the same key
+A_CACHE_SIZE = 1024
+_A_cache: "OrderedDict[Tuple[bytes, int], PolyMat]" = OrderedDict()
+_A_cache_lock = threading.Lock()
 
 
 def keygen(params: KyberParams = KYBER512) -> Tuple[bytes, bytes]:
@@ -14,26 +24,23 @@ def keygen(params: KyberParams = KYBER512) -> Tuple[bytes, bytes]:
     # 1. Generate random seed ρ ∈ B^32
     rho = os.urandom(32)
 
-    # 2. Generate matrix A ∈ R^(k×k) from ρ
-    A = generate_matrix_A(rho, params)
+    # 2. Generate matrix Â ∈ R^(k×k) from ρ, sampled directly in the NTT domain
+    A = cached_matrix_A(rho, params)
 
     # 3. Sample secret s ∈ R^k with coefficients in [-η, η]
-    s = [sample_noise_poly(params.eta1, params.n) for _ in range(params.k)]
+    s = PolyVec.from_polys([sample_noise_poly(params.eta1, params.n) for _ in range(params.k)])
 
     # 4. Sample error e ∈ R^k with coefficients in [-η, η]
-    e = [sample_noise_poly(params.eta1, params.n) for _ in range(params.k)]
+    e = PolyVec.from_polys([sample_noise_poly(params.eta1, params.n) for _ in range(params.k)])
 
-    # 5. Compute t = A ◦ s + e
-    t = [Polynomial([0] * params.n) for _ in range(params.k)]
-    for i in range(params.k):
-        for j in range(params.k):
-            t[i] += A[i][j] * s[j]
-        t[i] += e[i]
-        t[i] = ntt(t[i])
+    # 5. Compute t̂ = Â ◦ ŝ + ê with pointwise products in the NTT domain
+    s_hat = s.ntt()
+    t_hat = A.mul_vec(s_hat)
+    t_hat += e.ntt()
 
-    # 6. Return (pk, sk) = (encode_pk(t, rho), encode_sk(s))
-    pk = encode_pk(t, rho, params)
-    sk = encode_sk(s, params)
+    # 6. Return (pk, sk) = (encode_pk(t̂, rho), encode_sk(ŝ))
+    pk = encode_pk(t_hat, rho, params)
+    sk = encode_sk(s_hat, params)
     return pk, sk
 
 
@@ -42,35 +49,72 @@ def encrypt(pk: bytes, m: bytes, r: bytes, params: KyberParams = KYBER512) -> by
     Encrypt message m with public key pk using randomness r
     Returns: ciphertext as bytes
     """
-    # 1. Parse pk = (t, ρ)
-    t, rho = decode_pk(pk, params)
+    # 1. Parse pk = (t̂, ρ)
+    t_hat, rho = decode_pk(pk, params)
+
+    # 2. Generate matrix Â ∈ R^(k×k) from ρ
+    A = cached_matrix_A(rho, params)
+
+    # 3. Sample r ∈ R^k, e1 ∈ R^k and e2 ∈ R deterministically from r, one nonce each
+    k = params.k
+    r_vec = PolyVec.from_polys(
+        [sample_poly_from_seed(r + bytes([i]), params.eta1, params.n) for i in range(k)])
+    e1 = PolyVec.from_polys(
+        [sample_poly_from_seed(r + bytes([k + i]), params.eta2, params.n) for i in range(k)])
+    e2 = sample_poly_from_seed(r + bytes([2 * k]), params.eta2, params.n)
+    r_hat = r_vec.ntt()
+
+    # 4. Compute u = NTT^-1(Â^T ◦ r̂) + e1
+    u = A.transpose().mul_vec(r_hat).invntt()
+    u += e1
+
+    # 5. Compute v = NTT^-1(t̂^T ◦ r̂) + e2 + m
+    m_poly = decode_message(m, params.n, params.q)
+    v = invntt(t_hat.dot(r_hat))
+    v += e2
+    v += m_poly
+
+    # 6. Compress and return ciphertext
+    return compress_ciphertext(u, v, params)
 
-    # 2. Generate matrix A ∈ R^(k×k) from ρ
-    A = generate_matrix_A(rho, params)
 
-    # 3. Sample r ∈ R^k from randomness seed
-    r_poly = sample_poly_from_seed(r, params.eta1, params.n)
+def encrypt_batch(pk: bytes, msgs: List[bytes], coins: List[bytes],
+                  params: KyberParams = KYBER512) -> List[bytes]:
+    """
+    Encrypt len(msgs) messages to the same public key in one batched pass
+    Ciphertext b equals encrypt(pk, msgs[b], coins[b], params)
+    Returns: list of ciphertexts as bytes
+    """
+    if len(msgs) != len(coins):
+        raise ValueError(f"Got {len(msgs)} messages but {len(coins)} coin seeds")
 
-    # 4. Sample e1 ∈ R^k and e2 ∈ R
-    e1 = [sample_noise_poly(params.eta1, params.n) for _ in range(params.k)]
-    e2 = sample_noise_poly(params.eta2, params.n)
+    n, q = params.n, params.q
+    batch = len(msgs)
+    if batch == 0:
+        return []
 
-    # 5. Compute u = A^T ◦ r + e1
-    u = [Polynomial([0] * params.n) for _ in range(params.k)]
-    for i in range(params.k):
-        for j in range(params.k):
-            u[i] += A[j][i] * r_poly  # Note: A^T means we use A[j][i]
-        u[i] += e1[i]
+    # 1. Parse pk = (t̂, ρ) and fetch Â
+    t_hat, rho = decode_pk(pk, params)
+    A_T = cached_matrix_A(rho, params).transpose().data
 
-    # 6. Compute v = t^T ◦ r + e2 + m
-    m_poly = decode_message(m, params.n)
-    v = Polynomial([0] * params.n)
-    for i in range(params.k):
-        v += t[i] * r_poly
-    v += e2 + m_poly
+    # 2. Sample r (B, k, n), e1 (B, k, n) and e2 (B, n) from each coin seed
+    r_arr, e1_arr, e2_arr = sample_batch_noise(coins, params)
+    r_arr[...] = caddq(r_arr, q)
+    ntt_array(r_arr, q)
 
-    # 7. Compress and return ciphertext
-    return compress_ciphertext(u, v, params)
+    # 3. u = NTT^-1(Â^T ◦ r̂) + e1, the j-sum taken over axis 2 of (B, k, k, n)
+    u_arr = (basemul_array(A_T[None], r_arr[:, None], q).sum(axis=2) % q).astype(np.int16)
+    invntt_array(u_arr, q)
+    u_arr = cmod_q(u_arr + e1_arr, q)
+
+    # 4. v = NTT^-1(t̂^T ◦ r̂) + e2 + m
+    v_arr = (basemul_array(t_hat.data[None], r_arr, q).sum(axis=1) % q).astype(np.int16)
+    invntt_array(v_arr, q)
+    m_arr = np.array([decode_message(m, n, q).coeffs for m in msgs], dtype=np.int16)
+    v_arr = cmod_q(v_arr + e2_arr + m_arr, q)
+
+    # 5. Compress each ciphertext
+    return [compress_arrays(u_arr[b].ravel(), v_arr[b], params) for b in range(batch)]
 
 
 def decrypt(sk: bytes, c: bytes, params: KyberParams = KYBER512) -> bytes:
@@ -78,188 +122,208 @@ def decrypt(sk: bytes, c: bytes, params: KyberParams = KYBER512) -> bytes:
     Decrypt ciphertext c with secret key sk
     Returns: message as bytes
     """
-    # 1. Parse sk = s
-    s = decode_sk(sk, params)
+    # 1. Parse sk = ŝ
+    s_hat = decode_sk(sk, params)
 
     # 2. Decompress ciphertext to (u, v)
     u, v = decompress_ciphertext(c, params)
 
-    # 3. Compute m = v - s^T ◦ u
-    m_poly = v.copy()
-    for i in range(params.k):
-        m_poly -= s[i] * u[i]
+    # 3. Compute m = v - NTT^-1(ŝ^T ◦ NTT(u))
+    m_poly = v - invntt(s_hat.dot(u.ntt()))
 
     # 4. Decode and return message
-    return encode_message(m_poly, params.n)
+    return encode_message(m_poly, params.n, params.q)
 
 
 # Helper Functions ------------------------------------------------------------
 
-def generate_matrix_A(rho: bytes, params: KyberParams) -> List[List[Polynomial]]:
-    """Generate matrix A from seed ρ using SHAKE-128"""
-    A = [[None for _ in range(params.k)] for _ in range(params.k)]
+def generate_matrix_A(rho: bytes, params: KyberParams) -> PolyMat:
+    """Generate matrix Â from seed ρ using SHAKE-128, directly in the NTT domain"""
+    A = PolyMat.zeros(params.k, params.n, params.q)
     for i in range(params.k):
         for j in range(params.k):
-            # SHAKE-128 produces a stream of bytes for each polynomial
-            seed = rho + bytes([i, j])
-            stream = prf(seed, params.n * 3)  # 3 bytes per coefficient
-            coeffs = []
-            for k in range(params.n):
-                # Parse 3 bytes into a coefficient
-                val = int.from_bytes(stream[3 * k:3 * k + 3], 'little')
-                coeffs.append(val % params.q)
-            A[i][j] = Polynomial(coeffs)
+            # Â[i][j] = Parse(XOF(ρ ‖ j ‖ i))
+            seed = rho + bytes([j, i])
+            A.data[i, j] = sample_uniform(seed, params.n, params.q)
+    return A
+
+
+def cached_matrix_A(rho: bytes, params: KyberParams) -> PolyMat:
+    """
+    generate_matrix_A behind a bounded, thread-safe LRU cache keyed by (ρ, k)
+    The returned matrix is shared, so its buffer is made read-only
+    """
+    key = (rho, params.k)
+    with _A_cache_lock:
+        A = _A_cache.get(key)
+        if A is not None:
+            _A_cache.move_to_end(key)
+            return A
+
+    # Sample outside the lock; a concurrent miss on the same ρ builds an equal matrix
+    A = generate_matrix_A(rho, params)
+    A.data.flags.writeable = False
+    with _A_cache_lock:
+        _A_cache[key] = A
+        if len(_A_cache) > A_CACHE_SIZE:
+            _A_cache.popitem(last=False)
     return A
 
 
+def sample_uniform(seed: bytes, n: int, q: int) -> np.ndarray:
+    """Rejection-sample n coefficients uniform mod q from the XOF stream of seed"""
+    # Three blocks give 336 candidates, enough for n=256 almost always
+    length = 3 * SHAKE128_RATE
+    accepted = _parse_uniform(xof(seed, length), q)
+    while len(accepted) < n:
+        # hashlib cannot resume a squeeze: re-derive the stream one block longer
+        stream = xof(seed, length + SHAKE128_RATE)
+        accepted = np.concatenate((accepted, _parse_uniform(stream[length:], q)))
+        length += SHAKE128_RATE
+    return accepted[:n].astype(np.int16)
+
+
+def _parse_uniform(stream: bytes, q: int) -> np.ndarray:
+    """Split every 3 bytes into two 12-bit candidates and keep those below q"""
+    candidates = decode_12bit(stream)
+    return candidates[candidates < q]
+
+
+def sample_batch_noise(coins: List[bytes], params: KyberParams) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sample the encryption noise for every coin seed, with the same nonces as encrypt
+    Returns: r (B, k, n), e1 (B, k, n) and e2 (B, n) as int16 arrays
+    """
+    k, n = params.k, params.n
+    r_arr = np.empty((len(coins), k, n), dtype=np.int16)
+    e1_arr = np.empty((len(coins), k, n), dtype=np.int16)
+    e2_arr = np.empty((len(coins), n), dtype=np.int16)
+    for b, r in enumerate(coins):
+        for i in range(k):
+            r_arr[b, i] = cbd(params.eta1, prf(r + bytes([i]), params.eta1 * n // 4), n)
+            e1_arr[b, i] = cbd(params.eta2, prf(r + bytes([k + i]), params.eta2 * n // 4), n)
+        e2_arr[b] = cbd(params.eta2, prf(r + bytes([2 * k]), params.eta2 * n // 4), n)
+    return r_arr, e1_arr, e2_arr
+
+
 def sample_noise_poly(eta: int, n: int) -> Polynomial:
     """Sample polynomial with binomial noise distribution"""
-    coeffs = []
-    for _ in range(n):
-        # Binomial distribution: sum of η 1s minus sum of η -1s
-        val = sum(1 if os.urandom(1)[0] < 128 else -1 for _ in range(eta))
-        coeffs.append(val)
-    return Polynomial(coeffs)
+    # One bulk draw of 2η bits per coefficient
+    return Polynomial(cbd(eta, os.urandom(eta * n // 4), n))
 
 
 def sample_poly_from_seed(seed: bytes, eta: int, n: int) -> Polynomial:
     """Deterministically sample polynomial from seed"""
     # Expand seed using PRF
-    stream = prf(seed, n * eta)
-    coeffs = []
-    for i in range(n):
-        bits = stream[i * eta:(i + 1) * eta]
-        val = sum(1 if bit < 128 else -1 for bit in bits)
-        coeffs.append(val)
-    return Polynomial(coeffs)
+    return Polynomial(cbd(eta, prf(seed, eta * n // 4), n))
 
 
 # Serialization Functions -----------------------------------------------------
 
-def encode_pk(t: List[Polynomial], rho: bytes, params: KyberParams) -> bytes:
+def encode_pk(t: PolyVec, rho: bytes, params: KyberParams) -> bytes:
     """Serialize public key to bytes"""
-    pk = bytearray()
-    for poly in t:
-        for coeff in poly.coeffs:
-            pk += coeff.to_bytes(3, 'little')
-    pk += rho
-    return bytes(pk)
+    return encode_12bit(t.data.ravel()) + rho
 
 
-def decode_pk(pk: bytes, params: KyberParams) -> Tuple[List[Polynomial], bytes]:
+def decode_pk(pk: bytes, params: KyberParams) -> Tuple[PolyVec, bytes]:
     """Deserialize public key from bytes"""
-    t = []
-    pos = 0
-    for _ in range(params.k):
-        coeffs = []
-        for _ in range(params.n):
-            coeff = int.from_bytes(pk[pos:pos + 3], 'little')
-            coeffs.append(coeff)
-            pos += 3
-        t.append(Polynomial(coeffs))
-    rho = pk[pos:pos + 32]
+    t_len = params.k * params.n * 3 // 2
+    t = PolyVec(decode_12bit(pk[:t_len]).reshape(params.k, params.n), q=params.q)
+    rho = pk[t_len:t_len + 32]
     return t, rho
 
 
-def encode_sk(s: List[Polynomial], params: KyberParams) -> bytes:
+def encode_sk(s: PolyVec, params: KyberParams) -> bytes:
     """Serialize secret key to bytes"""
-    sk = bytearray()
-    for poly in s:
-        for coeff in poly.coeffs:
-            sk += coeff.to_bytes(2, 'little', signed=True)
-    return bytes(sk)
+    return s.data.astype('<i2').tobytes()
 
 
-def decode_sk(sk: bytes, params: KyberParams) -> List[Polynomial]:
+def decode_sk(sk: bytes, params: KyberParams) -> PolyVec:
     """Deserialize secret key from bytes"""
-    s = []
-    pos = 0
-    for _ in range(params.k):
-        coeffs = []
-        for _ in range(params.n):
-            coeff = int.from_bytes(sk[pos:pos + 2], 'little', signed=True)
-            coeffs.append(coeff)
-            pos += 2
-        s.append(Polynomial(coeffs))
-    return s
-
-
-def compress_ciphertext(u: List[Polynomial], v: Polynomial, params: KyberParams) -> bytes:
-    """Compress ciphertext components into bytes"""
-    c = bytearray()
+    # astype copies out of the read-only bytes buffer
+    coeffs = np.frombuffer(sk[:params.k * params.n * 2], dtype='<i2').astype(np.int16)
+    return PolyVec(coeffs.reshape(params.k, params.n), q=params.q)
 
-    # Compress u
-    for poly in u:
-        for coeff in poly.coeffs:
-            # Compress to du bits
-            compressed = ((coeff << params.du) + params.q // 2) // params.q
-            c.append(compressed & 0xff)
-            if params.du > 8:
-                c.append((compressed >> 8) & 0xff)
 
-    # Compress v
-    for coeff in v.coeffs:
-        # Compress to dv bits
-        compressed = ((coeff << params.dv) + params.q // 2) // params.q
-        c.append(compressed & 0xff)
-        if params.dv > 8:
-            c.append((compressed >> 8) & 0xff)
+def encode_12bit(values: np.ndarray) -> bytes:
+    """Pack pairs of 12-bit values little-endian into 3 bytes each"""
+    a = values[0::2].astype(np.uint16)
+    b = values[1::2].astype(np.uint16)
+    out = np.empty(3 * len(a), dtype=np.uint8)
+    out[0::3] = a & 0xff
+    out[1::3] = (a >> 8) | ((b & 0x0f) << 4)
+    out[2::3] = b >> 4
+    return out.tobytes()
+
+
+def decode_12bit(data: bytes) -> np.ndarray:
+    """Inverse of encode_12bit: two 12-bit values from every 3 bytes"""
+    buf = np.frombuffer(data, dtype=np.uint8).astype(np.uint16)
+    a = buf[0::3] | ((buf[1::3] & 0x0f) << 8)
+    b = (buf[1::3] >> 4) | (buf[2::3] << 4)
+    return np.column_stack((a, b)).ravel()
+
+
+def compress_ciphertext(u: PolyVec, v: Polynomial, params: KyberParams) -> bytes:
+    """Compress ciphertext components into bytes"""
+    return compress_arrays(u.data.ravel(), v.coeffs, params)
+
 
-    return bytes(c)
+def compress_arrays(u_arr: np.ndarray, v_arr: np.ndarray, params: KyberParams) -> bytes:
+    """Compress flat u (k*n) and v (n) coefficient arrays into ciphertext bytes"""
+    # Compress u to du bits and v to dv bits per coefficient
+    c_u = pack_bits(compress(u_arr, params.du, params.q), params.du)
+    c_v = pack_bits(compress(v_arr, params.dv, params.q), params.dv)
+    return c_u + c_v
 
 
-def decompress_ciphertext(c: bytes, params: KyberParams) -> Tuple[List[Polynomial], Polynomial]:
+def decompress_ciphertext(c: bytes, params: KyberParams) -> Tuple[PolyVec, Polynomial]:
     """Decompress ciphertext from bytes"""
-    u = []
-    pos = 0
+    u_len = params.k * params.n * params.du // 8
 
     # Decompress u
-    for _ in range(params.k):
-        coeffs = []
-        for _ in range(params.n):
-            if params.du <= 8:
-                compressed = c[pos]
-                pos += 1
-            else:
-                compressed = c[pos] | (c[pos + 1] << 8)
-                pos += 2
-            coeff = ((compressed * params.q) + (1 << (params.du - 1))) >> params.du
-            coeffs.append(coeff)
-        u.append(Polynomial(coeffs))
+    u_arr = decompress(unpack_bits(c[:u_len], params.du, params.k * params.n), params.du, params.q)
+    u = PolyVec(u_arr.reshape(params.k, params.n), q=params.q)
 
     # Decompress v
-    coeffs = []
-    for _ in range(params.n):
-        if params.dv <= 8:
-            compressed = c[pos]
-            pos += 1
-        else:
-            compressed = c[pos] | (c[pos + 1] << 8)
-            pos += 2
-        coeff = ((compressed * params.q) + (1 << (params.dv - 1))) >> params.dv
-        coeffs.append(coeff)
-    v = Polynomial(coeffs)
+    v = Polynomial(decompress(unpack_bits(c[u_len:], params.dv, params.n), params.dv, params.q))
 
     return u, v
 
 
-def decode_message(msg: bytes, n: int) -> Polynomial:
-    """Convert message bytes to polynomial"""
-    coeffs = []
-    for byte in msg:
-        bits = [(byte >> i) & 1 for i in range(8)]
-        coeffs.extend(bits)
-    return Polynomial(coeffs[:n])
-
-
-def encode_message(poly: Polynomial, n: int) -> bytes:
-    """Convert polynomial to message bytes"""
-    bits = [1 if coeff > 0 else 0 for coeff in poly.coeffs[:n]]
-    msg = bytearray()
-    for i in range(0, len(bits), 8):
-        byte = 0
-        for j in range(8):
-            if i + j < len(bits):
-                byte |= bits[i + j] << j
-        msg.append(byte)
-    return bytes(msg)
\ No newline at end of file
+def compress(x: np.ndarray, d: int, q: int) -> np.ndarray:
+    """Round x ∈ Z_q to d bits: ⌈(2^d / q) · x⌋ mod 2^d"""
+    x = x.astype(np.int32) % q  # x << d overflows int16
+    return (((x << d) + q // 2) // q) & ((1 << d) - 1)
+
+
+def decompress(x: np.ndarray, d: int, q: int) -> np.ndarray:
+    """Map d-bit values back to Z_q: ⌈(q / 2^d) · x⌋"""
+    return (x * q + (1 << (d - 1))) >> d
+
+
+def pack_bits(values: np.ndarray, d: int) -> bytes:
+    """Pack d-bit values little-endian into a contiguous bit string"""
+    bits = ((values[:, None] >> np.arange(d)) & 1).astype(np.uint8)
+    return np.packbits(bits.ravel(), bitorder='little').tobytes()
+
+
+def unpack_bits(data: bytes, d: int, count: int) -> np.ndarray:
+    """Inverse of pack_bits: read count d-bit values"""
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')
+    bits = bits[:count * d].reshape(count, d).astype(np.int32)
+    return (bits << np.arange(d)).sum(axis=1, dtype=np.int32)
+
+
+def decode_message(msg: bytes, n: int, q: int = 3329) -> Polynomial:
+    """Convert message bytes to polynomial: bit i becomes coefficient i·⌈q/2⌋"""
+    bits = np.unpackbits(np.frombuffer(msg, dtype=np.uint8), bitorder='little')[:n]
+    return Polynomial(bits.astype(np.int16) * np.int16((q + 1) // 2), n=n, q=q)
+
+
+def encode_message(poly: Polynomial, n: int, q: int = 3329) -> bytes:
+    """Convert polynomial to message bytes: bit i is set when coefficient i is closer to q/2 than to 0"""
+    # Compress_q(x, 1) is 1 exactly for q/4 < x < 3q/4 (rounded)
+    bits = compress(np.asarray(poly.coeffs[:n]), 1, q).astype(np.uint8)
+    return np.packbits(bits, bitorder='little').tobytes()
+
@@ -1,56 +1,99 @@
+import numpy as np
+
+
+# Branchless reductions: the sign bit of x (|x| < 2^15) selects whether q is
+# added, replacing NumPy's integer division in % on internal add/sub paths
+# whose operand ranges are known. Public operators keep % q for any input
+
+def caddq(x: np.ndarray, q: int = 3329) -> np.ndarray:
+    """x mod q for x in [-q, q): add q where x is negative"""
+    return x + ((x >> 15) & q)
+
+
+def csubq(x: np.ndarray, q: int = 3329) -> np.ndarray:
+    """x mod q for x in [0, 2q): subtract q, then add it back where that went negative"""
+    return caddq(x - q, q)
+
+
+def cmod_q(x: np.ndarray, q: int = 3329) -> np.ndarray:
+    """x mod q for x in (-2q, 2q), any sum or difference of two coefficients in (-q, q)"""
+    return csubq(caddq(caddq(x, q), q), q)
+
+
+def as_coeff_array(values, q: int = 3329) -> np.ndarray:
+    """
+    Contiguous int16 coefficient array; int16 input is kept as is (views stay
+    views), anything else is reduced mod q first so narrowing cannot wrap
+    """
+    arr = np.asarray(values)
+    if arr.dtype != np.int16:
+        arr = np.asarray(arr % q, dtype=np.int64)
+    return np.ascontiguousarray(arr, dtype=np.int16)
+
+
 class Polynomial:
     def __init__(self, coeffs=None, n=256, q=3329):
         """
         Initialize a polynomial with:
-        - coeffs: coefficient list (default all zeros)
+        - coeffs: coefficient list or array (default all zeros)
         - n: maximum degree (default 256 for Kyber)
         - q: modulus (default 3329 for Kyber)
+        Coefficients are held in a contiguous int16 ndarray; wider input is reduced mod q
         """
         self.n = n
         self.q = q
-        self.coeffs = coeffs or [0] * n
+        if coeffs is not None:
+            self.coeffs = as_coeff_array(coeffs, q)
+        else:
+            self.coeffs = np.zeros(n, dtype=np.int16)
 
     def __add__(self, other):
         """Add two polynomials element-wise modulo q"""
-        if self.n != other.n or self.q != other.q:
-            raise ValueError("Polynomials must have same degree and modulus")
-        return Polynomial(
-            [(a + b) % self.q for a, b in zip(self.coeffs, other.coeffs)],
-            n=self.n,
-            q=self.q
-        )
+        result = self.copy()
+        result += other
+        return result
 
     def __sub__(self, other):
         """Subtract two polynomials element-wise modulo q"""
+        result = self.copy()
+        result -= other
+        return result
+
+    def __iadd__(self, other):
+        """Add other in place, reusing this polynomial's buffer"""
         if self.n != other.n or self.q != other.q:
             raise ValueError("Polynomials must have same degree and modulus")
-        return Polynomial(
-            [(a - b) % self.q for a, b in zip(self.coeffs, other.coeffs)],
-            n=self.n,
-            q=self.q
-        )
+        # Sum in int32 so int16 coefficients cannot wrap before the reduction
+        self.coeffs[...] = np.add(self.coeffs, other.coeffs, dtype=np.int32) % self.q
+        return self
+
+    def __isub__(self, other):
+        """Subtract other in place, reusing this polynomial's buffer"""
+        if self.n != other.n or self.q != other.q:
+            raise ValueError("Polynomials must have same degree and modulus")
+        self.coeffs[...] = np.subtract(self.coeffs, other.coeffs, dtype=np.int32) % self.q
+        return self
 
     def __mul__(self, other):
         """Multiply two polynomials using schoolbook multiplication"""
         if self.n != other.n or self.q != other.q:
             raise ValueError("Polynomials must have same degree and modulus")
 
-        # Schoolbook multiplication
-        res = [0] * (2 * self.n)
-        for i in range(self.n):
-            for j in range(self.n):
-                res[i + j] = (res[i + j] + self.coeffs[i] * other.coeffs[j]) % self.q
+        # Schoolbook multiplication as one full convolution
+        res = np.convolve(self.coeffs.astype(np.int64), other.coeffs.astype(np.int64))
 
         # Modulo x^n + 1 (reduce higher terms)
-        for i in range(self.n, 2 * self.n):
-            res[i - self.n] = (res[i - self.n] - res[i]) % self.q
+        res = res[:self.n] - np.append(res[self.n:], 0)
+        return Polynomial(res % self.q, n=self.n, q=self.q)
 
-        return Polynomial(res[:self.n], n=self.n, q=self.q)
+    def pointwise(self, other):
+        """Multiply two NTT-domain polynomials (returns new polynomial)"""
+        return basemul(self, other)
 
     def __mod__(self, modulus):
         """Apply modulus to all coefficients"""
         return Polynomial(
-            [c % modulus for c in self.coeffs],
+            self.coeffs % modulus,
             n=self.n,
             q=modulus
         )
@@ -65,14 +108,16 @@ class Polynomial:
 
     def to_ntt(self):
         """Convert to NTT domain (returns new polynomial)"""
-        from .ntt import ntt  # Import here to avoid circular imports
         return ntt(self)
 
     def to_normal(self):
         """Convert from NTT domain (returns new polynomial)"""
-        from .ntt import invntt  # Import here to avoid circular imports
         return invntt(self)
 
     def __repr__(self):
         """String representation showing first 3 coefficients"""
-        return f"Polynomial(n={self.n}, q={self.q}, coeffs={self.coeffs[:3]}...)"
\ No newline at end of file
+        return f"Polynomial(n={self.n}, q={self.q}, coeffs={self.coeffs[:3]}...)"
+
+
+# ntt.py builds on Polynomial, so bind its transforms once the class exists
+from .ntt import ntt, invntt, basemul  # noqa: E402
@@ -0,0 +1,123 @@
+import numpy as np
+
+from .poly import Polynomial, as_coeff_array
+from .ntt import ntt_array, invntt_array, basemul_array
+
+
+class PolyVec:
+    def __init__(self, data, q=3329):
+        """
+        Initialize a vector of k polynomials with:
+        - data: (k, n) coefficient array, one row per polynomial
+        - q: modulus (default 3329 for Kyber)
+        All coefficients live in one contiguous int16 ndarray; wider input is reduced mod q
+        """
+        self.data = as_coeff_array(data, q)
+        self.q = q
+
+    @classmethod
+    def zeros(cls, k, n=256, q=3329):
+        """Vector of k zero polynomials"""
+        return cls(np.zeros((k, n), dtype=np.int16), q=q)
+
+    @classmethod
+    def from_polys(cls, polys):
+        """Stack a list of Polynomials into one vector"""
+        return cls(np.array([poly.coeffs for poly in polys], dtype=np.int16), q=polys[0].q)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, i):
+        """Polynomial i, sharing this vector's buffer"""
+        return Polynomial(self.data[i], n=self.data.shape[1], q=self.q)
+
+    def __add__(self, other):
+        """Add two vectors element-wise modulo q"""
+        result = self.copy()
+        result += other
+        return result
+
+    def __iadd__(self, other):
+        """Add other in place, reusing this vector's buffer"""
+        # Sum in int32 so int16 coefficients cannot wrap before the reduction
+        self.data[...] = np.add(self.data, other.data, dtype=np.int32) % self.q
+        return self
+
+    def __sub__(self, other):
+        """Subtract two vectors element-wise modulo q"""
+        result = self.copy()
+        result -= other
+        return result
+
+    def __isub__(self, other):
+        """Subtract other in place, reusing this vector's buffer"""
+        self.data[...] = np.subtract(self.data, other.data, dtype=np.int32) % self.q
+        return self
+
+    def copy(self):
+        """Create a deep copy of the vector"""
+        return PolyVec(self.data.copy(), q=self.q)
+
+    def ntt(self):
+        """Convert every polynomial to the NTT domain (returns new vector)"""
+        res = self.data % self.q
+        ntt_array(res, self.q)
+        return PolyVec(res, q=self.q)
+
+    def invntt(self):
+        """Convert every polynomial from the NTT domain (returns new vector)"""
+        res = self.data % self.q
+        invntt_array(res, self.q)
+        return PolyVec(res, q=self.q)
+
+    def pointwise(self, other):
+        """Element-wise NTT-domain product of two vectors (returns new vector)"""
+        return PolyVec(basemul_array(self.data, other.data, self.q), q=self.q)
+
+    def dot(self, other):
+        """NTT-domain inner product Σ_i self[i] ◦ other[i]"""
+        acc = basemul_array(self.data, other.data, self.q).sum(axis=0) % self.q
+        return Polynomial(acc, n=self.data.shape[1], q=self.q)
+
+    def __repr__(self):
+        """String representation showing the vector shape"""
+        k, n = self.data.shape
+        return f"PolyVec(k={k}, n={n}, q={self.q})"
+
+
+class PolyMat:
+    def __init__(self, data, q=3329):
+        """
+        Initialize a k×k matrix of polynomials with:
+        - data: (k, k, n) coefficient array
+        - q: modulus (default 3329 for Kyber)
+        """
+        self.data = as_coeff_array(data, q)
+        self.q = q
+
+    @classmethod
+    def zeros(cls, k, n=256, q=3329):
+        """k×k matrix of zero polynomials"""
+        return cls(np.zeros((k, k, n), dtype=np.int16), q=q)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, i):
+        """Row i as a PolyVec, so A[i][j] is a Polynomial"""
+        return PolyVec(self.data[i], q=self.q)
+
+    def transpose(self):
+        """Matrix transpose (returns new matrix)"""
+        return PolyMat(self.data.transpose(1, 0, 2), q=self.q)
+
+    def mul_vec(self, vec):
+        """NTT-domain matrix-vector product: row i is Σ_j self[i][j] ◦ vec[j]"""
+        acc = basemul_array(self.data, vec.data[None, :, :], self.q).sum(axis=1) % self.q
+        return PolyVec(acc, q=self.q)
+
+    def __repr__(self):
+        """String representation showing the matrix shape"""
+        k, _, n = self.data.shape
+        return f"PolyMat(k={k}, n={n}, q={self.q})"
@@ -2,6 +2,25 @@ import os
 from hashlib import shake_128
 from typing import Tuple
 
+import numpy as np
+
+# SHAKE-128 absorbs and squeezes 168 bytes per Keccak-f[1600] permutation
+SHAKE128_RATE = 168
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+# CBD lookup tables: η=2 maps a byte to its two coefficients,
+# η=3 maps a 6-bit chunk to one coefficient
+CBD2_LUT = np.array(
+    [[_popcount(i & 3) - _popcount((i >> 2) & 3), _popcount((i >> 4) & 3) - _popcount(i >> 6)]
+     for i in range(256)],
+    dtype=np.int32
+)
+CBD3_LUT = np.array([_popcount(i & 7) - _popcount(i >> 3) for i in range(64)], dtype=np.int32)
+
 
 def hash_g(msg: bytes) -> bytes:
     """
@@ -53,20 +72,25 @@ def parse_hash_g_output(hash_output: bytes) -> Tuple[bytes, bytes]:
     return hash_output[:32], hash_output[32:]
 
 
-def cbd(eta: int, buf: bytes, n: int = 256) -> list:
+def cbd(eta: int, buf: bytes, n: int = 256) -> np.ndarray:
     """
     Centered Binomial Distribution sampling
     Converts input bytes to polynomial coefficients following CBD
+    Coefficient i is popcount(a) - popcount(b) of the 2η bits starting at bit 2ηi
     """
     if len(buf) != eta * n // 4:
         raise ValueError(f"Input buffer must be {eta * n // 4} bytes for η={eta}")
 
-    coefficients = []
-    for i in range(n):
-        a = sum((buf[4 * i + j // 8] >> (j % 8)) & 1 for j in range(eta))
-        b = sum((buf[4 * i + j // 8 + eta // 2] >> (j % 8)) & 1 for j in range(eta))
-        coefficients.append(a - b)
-    return coefficients
+    b = np.frombuffer(buf, dtype=np.uint8)
+    if eta == 2:
+        # Each byte holds two 4-bit samples
+        return CBD2_LUT[b].reshape(n)
+    if eta == 3:
+        # Each 3 bytes hold four 6-bit samples
+        w = b[0::3].astype(np.uint32) | (b[1::3].astype(np.uint32) << 8) | (b[2::3].astype(np.uint32) << 16)
+        chunks = (w[:, None] >> np.array([0, 6, 12, 18], dtype=np.uint32)) & 0x3f
+        return CBD3_LUT[chunks].reshape(n)
+    raise ValueError(f"Unsupported η={eta}, expected 2 or 3")
 
 
 def generate_random_bytes(length: int = 32) -> bytes:
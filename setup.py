@@ -0,0 +1,22 @@
+from setuptools import Extension, setup
+
+# AVX2 code paths carry their own target attribute and are picked at runtime,
+# NEON is baseline on aarch64, so only the optimisation level is global.
+# The extension is optional: without a compiler the Numba/NumPy NTT is used
+extra_compile_args = ["-O3"]
+
+setup(
+    name="kyber",
+    version="1.0.0",
+    packages=["kyber"],
+    install_requires=["numpy"],
+    extras_require={"numba": ["numba"]},
+    ext_modules=[
+        Extension(
+            "kyber._ntt_avx2",
+            sources=["kyber/_ntt_avx2.c"],
+            extra_compile_args=extra_compile_args,
+            optional=True,
+        )
+    ],
+)
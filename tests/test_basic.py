@@ -32,5 +32,18 @@ def test_encryption():
     print("SUCCESS! Test passed.")
 
 
+def test_all_parameter_sets():
+    from kyber import Kyber768, Kyber1024
+
+    for kem in (Kyber512(), Kyber768(), Kyber1024()):
+        pk, sk = kem.keypair()
+        ct, ss = kem.encapsulate(pk)
+        assert kem.decapsulate(ct, sk) == ss
+
+        # A tampered ciphertext falls back to the implicit-rejection secret
+        tampered = bytes([ct[0] ^ 1]) + ct[1:]
+        assert kem.decapsulate(tampered, sk) != ss
+
+
 if __name__ == "__main__":
     test_encryption()
\ No newline at end of file
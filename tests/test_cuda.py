@@ -0,0 +1,36 @@
+# tests/test_cuda.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numba")
+
+ROOT = Path(__file__).parent.parent
+
+# The simulator is chosen when numba.cuda is first imported, so the check
+# runs in a fresh interpreter with NUMBA_ENABLE_CUDASIM set
+SIMULATOR_CHECK = """
+import os
+from kyber import KYBER512, KYBER768, KYBER1024
+from kyber import _cuda
+from kyber.pke import keygen, encrypt
+
+_cuda.CUDA_MIN_BATCH = 1
+for params in (KYBER512, KYBER768, KYBER1024):
+    pks = [keygen(params)[0] for _ in range(2)]
+    msgs = [bytes([b]) * 32 for b in range(2)]
+    coins = [bytes([0x80 | b]) * 32 for b in range(2)]
+    expected = [encrypt(pk, m, r, params) for pk, m, r in zip(pks, msgs, coins)]
+    assert _cuda.encrypt_batch_cuda(pks, msgs, coins, params) == expected, params
+"""
+
+
+def test_encrypt_batch_cuda_matches_encrypt_in_simulator():
+    env = dict(os.environ, NUMBA_ENABLE_CUDASIM="1")
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", SIMULATOR_CHECK],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    print("Test passed!")
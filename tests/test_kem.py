@@ -0,0 +1,51 @@
+# tests/test_kem.py
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from kyber import KyberKEM, KYBER512
+
+
+def test_h_pk_cache_evicts_least_recently_used():
+    kem = KyberKEM(KYBER512, cache_size=2)
+    pks = [kem.keypair()[0] for _ in range(3)]
+
+    kem.preload_pk(pks[0])
+    kem.preload_pk(pks[1])
+    kem.encapsulate(pks[0])  # pks[0] becomes the most recently used
+    kem.preload_pk(pks[2])   # evicts pks[1]
+
+    assert list(kem._h_pk_cache) == [pks[0], pks[2]]
+    print("Test passed!")
+
+
+def test_encapsulate_many_round_trip():
+    kem = KyberKEM(KYBER512)
+    pk, sk = kem.keypair()
+
+    results = kem.encapsulate_many(pk, 4)
+    assert len(results) == 4
+    for ct, ss in results:
+        assert kem.decapsulate(ct, sk) == ss
+    assert len({ss for _, ss in results}) == 4
+    print("Test passed!")
+
+
+def test_h_pk_cache_from_threads():
+    kem = KyberKEM(KYBER512, cache_size=4)
+    pks = [kem.keypair()[0] for _ in range(8)] * 8
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        hashes = list(pool.map(kem._hash_pk, pks))
+
+    assert hashes[:8] * 8 == hashes
+    assert len(kem._h_pk_cache) <= 4
+    print("Test passed!")
+
+
+if __name__ == "__main__":
+    test_h_pk_cache_evicts_least_recently_used()
+    test_encapsulate_many_round_trip()
+    test_h_pk_cache_from_threads()
@@ -6,7 +6,27 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Now import from your package
-from kyber.ntt import Polynomial, ntt, invntt
+import random
+
+import numpy as np
+
+from kyber.ntt import Polynomial, ntt, invntt, invntt_array, _ntt_levels, _invntt_levels
+
+
+def compiled_kernels():
+    """(name, ntt_kernel, invntt_kernel) for every compiled backend that loads"""
+    kernels = []
+    try:
+        from kyber import _ntt_c
+        kernels.append((_ntt_c.BACKEND, _ntt_c.ntt_kernel, _ntt_c.invntt_kernel))
+    except (ImportError, OSError):
+        pass
+    try:
+        from kyber import _ntt_numba
+        kernels.append(("numba", _ntt_numba.ntt_kernel, _ntt_numba.invntt_kernel))
+    except ImportError:
+        pass
+    return kernels
 
 
 def test_ntt():
@@ -27,5 +47,59 @@ def test_ntt():
     print("Test passed!")
 
 
+def test_ntt_kernel_matches_numpy():
+    coeffs = np.array([random.randrange(3329) for _ in range(256)], dtype=np.int16)
+    forward = coeffs.copy()
+    _ntt_levels(forward, 3329)
+
+    for name, ntt_kernel, invntt_kernel in compiled_kernels():
+        print("Checking", name)
+        res = coeffs.copy()
+        ntt_kernel(res)
+        assert np.array_equal(res, forward)
+
+        invntt_kernel(res)
+        assert np.array_equal(res, coeffs)
+    print("Test passed!")
+
+
+def test_invntt_levels_matches_kernels():
+    coeffs = np.array([[random.randrange(3329) for _ in range(256)] for _ in range(3)], dtype=np.int16)
+    inverse = coeffs.copy()
+    _invntt_levels(inverse, 3329)
+
+    # The NumPy fallback undoes its own forward pass
+    res = coeffs.copy()
+    _ntt_levels(res, 3329)
+    _invntt_levels(res, 3329)
+    assert np.array_equal(res, coeffs)
+
+    # ...and agrees with whichever backend invntt_array dispatches to
+    res = coeffs.copy()
+    invntt_array(res)
+    assert np.array_equal(res, inverse)
+
+    for name, _, invntt_kernel in compiled_kernels():
+        print("Checking", name)
+        res = coeffs.copy()
+        invntt_kernel(res)
+        assert np.array_equal(res, inverse)
+    print("Test passed!")
+
+
+def test_pointwise_matches_schoolbook():
+    a = Polynomial([random.randrange(3329) for _ in range(256)])
+    b = Polynomial([random.randrange(3329) for _ in range(256)])
+
+    expected = a * b
+    product = invntt(ntt(a).pointwise(ntt(b)))
+
+    assert all((x - y) % 3329 == 0 for x, y in zip(expected.coeffs, product.coeffs))
+    print("Test passed!")
+
+
 if __name__ == "__main__":
-    test_ntt()
\ No newline at end of file
+    test_ntt()
+    test_ntt_kernel_matches_numpy()
+    test_invntt_levels_matches_kernels()
+    test_pointwise_matches_schoolbook()
\ No newline at end of file
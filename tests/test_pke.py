@@ -0,0 +1,98 @@
+# tests/test_pke.py
+import os
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from kyber import KYBER512, KYBER768, KYBER1024, KyberKEM
+from kyber.pke import (keygen, encrypt, encrypt_batch, cached_matrix_A, decode_sk,
+                       encode_12bit, decode_12bit, sample_uniform)
+from kyber.symmetric import xof
+
+PARAMETER_SETS = [KYBER512, KYBER768, KYBER1024]
+
+
+def test_cached_matrix_A_is_read_only():
+    rho = os.urandom(32)
+    A = cached_matrix_A(rho, KYBER512)
+    assert cached_matrix_A(rho, KYBER512) is A
+
+    with pytest.raises(ValueError):
+        A[0][0] += A[0][1]
+    print("Test passed!")
+
+
+def test_cached_matrix_A_from_threads():
+    seeds = [os.urandom(32) for _ in range(8)] * 4
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        matrices = list(pool.map(lambda rho: cached_matrix_A(rho, KYBER512), seeds))
+
+    for rho, A in zip(seeds, matrices):
+        assert (A.data == cached_matrix_A(rho, KYBER512).data).all()
+    print("Test passed!")
+
+
+@pytest.mark.parametrize("params", PARAMETER_SETS)
+def test_encrypt_batch_matches_encrypt(params):
+    pk, _ = keygen(params)
+    msgs = [bytes([b]) * 32 for b in range(5)]
+    coins = [bytes([0x80 | b]) * 32 for b in range(5)]
+
+    expected = [encrypt(pk, m, r, params) for m, r in zip(msgs, coins)]
+    assert encrypt_batch(pk, msgs, coins, params) == expected
+    print("Test passed!")
+
+
+def test_empty_batch():
+    kem = KyberKEM(KYBER512)
+    pk, _ = kem.keypair()
+
+    assert encrypt_batch(pk, [], [], KYBER512) == []
+    assert kem.encapsulate_many(pk, 0) == []
+    print("Test passed!")
+
+
+def test_encrypt_batch_rejects_mismatched_lengths():
+    pk, _ = keygen(KYBER512)
+    with pytest.raises(ValueError):
+        encrypt_batch(pk, [bytes(32)] * 3, [bytes(32)] * 2, KYBER512)
+    print("Test passed!")
+
+
+def test_decoded_secret_key_is_writable():
+    _, sk = keygen(KYBER512)
+    s = decode_sk(sk, KYBER512)
+    expected = (2 * s.data.astype(int)) % 3329
+
+    s += s
+    assert (s.data == expected).all()
+    print("Test passed!")
+
+
+def test_12bit_round_trip():
+    values = np.random.randint(0, 3329, 2 * 384, dtype=np.int16)
+    packed = encode_12bit(values)
+    assert len(packed) == 3 * len(values) // 2
+    assert np.array_equal(decode_12bit(packed), values)
+    print("Test passed!")
+
+
+@pytest.mark.parametrize("params", PARAMETER_SETS)
+def test_public_key_length(params):
+    pk, _ = keygen(params)
+    assert len(pk) == 384 * params.k + 32
+    print("Test passed!")
+
+
+def test_sample_uniform_tops_up_from_the_same_stream():
+    seed = bytes(range(34))
+    # 800 coefficients need more than the three blocks read up front
+    candidates = decode_12bit(xof(seed, 10 * 168))
+    expected = candidates[candidates < 3329][:800]
+    assert np.array_equal(sample_uniform(seed, 800, 3329), expected)
+    print("Test passed!")
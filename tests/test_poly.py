@@ -0,0 +1,70 @@
+# tests/test_poly.py
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from kyber import Polynomial, PolyVec
+from kyber.poly import caddq, csubq, cmod_q
+
+Q = 3329
+
+
+def test_wide_coefficients_are_reduced_before_narrowing():
+    assert (Polynomial(np.array([40000] * 256)).coeffs == 40000 % 3329).all()
+    assert (Polynomial([2 ** 15, -5] + [0] * 254).coeffs[:2] == [2 ** 15 % 3329, 3324]).all()
+    assert (PolyVec(np.full((2, 256), 40000)).data == 40000 % 3329).all()
+    print("Test passed!")
+
+
+def test_int16_coefficients_are_shared():
+    vec = PolyVec.zeros(2)
+    vec[1].coeffs[0] = 7
+    assert vec.data[1, 0] == 7
+    print("Test passed!")
+
+
+def test_branchless_reductions_at_boundaries():
+    caddq_in = np.array([-Q, -Q + 1, -1, 0, Q - 1], dtype=np.int16)
+    csubq_in = np.array([0, Q - 1, Q, Q + 1, 2 * Q - 1], dtype=np.int16)
+    cmod_q_in = np.array([-2 * Q + 1, -Q - 1, -Q, -1, 0, Q, Q + 1, 2 * Q - 1], dtype=np.int16)
+
+    for reduce, values in ((caddq, caddq_in), (csubq, csubq_in), (cmod_q, cmod_q_in)):
+        assert np.array_equal(reduce(values), values % Q)
+
+    # Whole documented domain of cmod_q, in both storage widths
+    domain = np.arange(-2 * Q + 1, 2 * Q)
+    assert np.array_equal(cmod_q(domain.astype(np.int16)), domain % Q)
+    assert np.array_equal(cmod_q(domain.astype(np.int32)), domain % Q)
+    print("Test passed!")
+
+
+def test_add_sub_reduce_any_coefficients():
+    big = np.full(256, 7000, dtype=np.int16)
+    assert ((Polynomial(big) + Polynomial()).coeffs == 7000 % Q).all()
+    assert ((Polynomial() - Polynomial(big)).coeffs == -7000 % Q).all()
+
+    vec = PolyVec(np.full((2, 256), 7000, dtype=np.int16))
+    assert ((vec + PolyVec.zeros(2)).data == 7000 % Q).all()
+
+    # int16 values >= 2^14 would wrap if summed in int16
+    for x, y in ((20000, 20000), (-20000, 20000), (-32768, 32767)):
+        a = Polynomial(np.full(256, x, dtype=np.int16))
+        b = Polynomial(np.full(256, y, dtype=np.int16))
+        assert ((a + b).coeffs == (x + y) % Q).all()
+        assert ((a - b).coeffs == (x - y) % Q).all()
+
+        u = PolyVec(np.full((2, 256), x, dtype=np.int16))
+        v = PolyVec(np.full((2, 256), y, dtype=np.int16))
+        assert ((u + v).data == (x + y) % Q).all()
+        assert ((u - v).data == (x - y) % Q).all()
+    print("Test passed!")
+
+
+if __name__ == "__main__":
+    test_wide_coefficients_are_reduced_before_narrowing()
+    test_int16_coefficients_are_shared()
+    test_branchless_reductions_at_boundaries()
+    test_add_sub_reduce_any_coefficients()
@@ -0,0 +1,40 @@
+# tests/test_symmetric.py
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from kyber.symmetric import cbd
+
+
+def cbd_reference(eta, buf, n=256):
+    """Bit-by-bit CBD: coefficient i is Σ a_j - Σ b_j over the 2η bits at 2ηi"""
+    bits = [(byte >> j) & 1 for byte in buf for j in range(8)]
+    coeffs = []
+    for i in range(n):
+        a = sum(bits[2 * eta * i + j] for j in range(eta))
+        b = sum(bits[2 * eta * i + eta + j] for j in range(eta))
+        coeffs.append(a - b)
+    return coeffs
+
+
+@pytest.mark.parametrize("eta", [2, 3])
+def test_cbd_matches_reference(eta):
+    for _ in range(20):
+        buf = os.urandom(eta * 256 // 4)
+        coeffs = cbd(eta, buf)
+        assert np.array_equal(coeffs, cbd_reference(eta, buf))
+        assert coeffs.min() >= -eta and coeffs.max() <= eta
+    print("Test passed!")
+
+
+def test_cbd_rejects_bad_input():
+    with pytest.raises(ValueError):
+        cbd(2, bytes(127))
+    with pytest.raises(ValueError):
+        cbd(4, bytes(256))
+    print("Test passed!")